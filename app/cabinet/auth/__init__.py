@@ -1,6 +1,12 @@
 """Cabinet authentication module."""
 
-from .password_utils import hash_password, verify_password
+from .password_utils import (
+    hash_password,
+    verify_password,
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
+)
 from .jwt_handler import (
     create_access_token,
     create_refresh_token,
@@ -12,6 +18,9 @@ from .telegram_auth import validate_telegram_login_widget, validate_telegram_ini
 __all__ = [
     "hash_password",
     "verify_password",
+    "hash_password_async",
+    "verify_password_async",
+    "password_needs_rehash",
     "create_access_token",
     "create_refresh_token",
     "decode_token",
@@ -1,6 +1,7 @@
 """Email verification token generation and validation."""
 
-import secrets
+import hashlib
+import os
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -12,9 +13,9 @@ def generate_verification_token() -> str:
     Generate a secure random verification token.
 
     Returns:
-        32-character hex token string
+        64-character hex token string (32 random bytes)
     """
-    return secrets.token_hex(32)
+    return os.urandom(32).hex()
 
 
 def generate_password_reset_token() -> str:
@@ -22,9 +23,25 @@ def generate_password_reset_token() -> str:
     Generate a secure random password reset token.
 
     Returns:
-        32-character hex token string
+        64-character hex token string (32 random bytes)
     """
-    return secrets.token_hex(32)
+    return os.urandom(32).hex()
+
+
+def hash_email_token(token: str) -> str:
+    """
+    Get the value stored in the database for an emailed token.
+
+    Only this digest is persisted, so a database dump does not expose live
+    verification or reset links.
+
+    Args:
+        token: Raw token sent to the user
+
+    Returns:
+        32-character hex BLAKE2b digest
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
 
 
 def get_verification_expires_at() -> datetime:
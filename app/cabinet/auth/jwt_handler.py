@@ -1,12 +1,88 @@
 """JWT token handling for cabinet authentication."""
 
+import base64
+import hashlib
+import hmac
+import time
 import jwt
+import orjson
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
 from app.config import settings
+from app.utils.ttl_cache import TTLCache
 
 JWT_ALGORITHM = "HS256"
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
+
+# Single PyJWT instance shared by all decode calls
+_JWT = jwt.PyJWT()
+
+# Verified payloads keyed by token digest; each entry lives no longer than the token itself
+PAYLOAD_CACHE_TTL_SECONDS = 300
+_payload_cache: TTLCache[bytes, Dict[str, Any]] = TTLCache(
+    maxsize=10000,
+    ttl=PAYLOAD_CACHE_TTL_SECONDS,
+)
+
+
+@lru_cache(maxsize=1)
+def _secret_bytes() -> bytes:
+    """Return the signing secret as bytes, shared by encode and decode."""
+    return settings.get_cabinet_jwt_secret().encode("utf-8")
+
+
+@lru_cache(maxsize=1)
+def _hs256_signer() -> "hmac.HMAC":
+    """HMAC keyed with the signing secret; copies skip the per-token key schedule."""
+    return hmac.new(_secret_bytes(), digestmod=hashlib.sha256)
+
+
+@lru_cache(maxsize=1)
+def _fingerprint_key() -> bytes:
+    """BLAKE2b key derived from the signing secret (keys are limited to 64 bytes)."""
+    return hashlib.sha256(b"cabinet-refresh-token:" + _secret_bytes()).digest()
+
+
+@lru_cache(maxsize=4096)
+def refresh_token_fingerprint(token: str) -> str:
+    """
+    Keyed lookup key under which a refresh token is stored in the database.
+
+    Args:
+        token: Encoded refresh token
+
+    Returns:
+        32-character hex BLAKE2b digest
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16, key=_fingerprint_key()).hexdigest()
+
+
+def reset_jwt_secret_cache() -> None:
+    """Drop the cached secret, derived keys and verified payloads after secret rotation."""
+    _secret_bytes.cache_clear()
+    _hs256_signer.cache_clear()
+    _fingerprint_key.cache_clear()
+    refresh_token_fingerprint.cache_clear()
+    _payload_cache.clear()
+
+
+def _b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# The header never changes for HS256 tokens, so it is encoded once
+_HS256_HEADER_SEGMENT = _b64url_encode(orjson.dumps({"alg": JWT_ALGORITHM, "typ": "JWT"}))
+
+
+def _hs256_encode(payload: Dict[str, Any]) -> str:
+    """Sign a payload as a compact HS256 JWT without PyJWT's algorithm dispatch."""
+    signing_input = _HS256_HEADER_SEGMENT + b"." + _b64url_encode(orjson.dumps(payload))
+    signer = _hs256_signer().copy()
+    signer.update(signing_input)
+    signature = signer.digest()
+    return (signing_input + b"." + _b64url_encode(signature)).decode("ascii")
 
 
 def create_access_token(user_id: int, telegram_id: int) -> str:
@@ -21,18 +97,17 @@ def create_access_token(user_id: int, telegram_id: int) -> str:
         Encoded JWT access token
     """
     expire_minutes = settings.get_cabinet_access_token_expire_minutes()
-    expires = datetime.utcnow() + timedelta(minutes=expire_minutes)
+    now = int(time.time())
 
     payload = {
         "sub": str(user_id),
         "telegram_id": telegram_id,
         "type": "access",
-        "exp": expires,
-        "iat": datetime.utcnow(),
+        "exp": now + expire_minutes * 60,
+        "iat": now,
     }
 
-    secret = settings.get_cabinet_jwt_secret()
-    return jwt.encode(payload, secret, algorithm=JWT_ALGORITHM)
+    return _hs256_encode(payload)
 
 
 def create_refresh_token(user_id: int) -> str:
@@ -46,17 +121,16 @@ def create_refresh_token(user_id: int) -> str:
         Encoded JWT refresh token
     """
     expire_days = settings.get_cabinet_refresh_token_expire_days()
-    expires = datetime.utcnow() + timedelta(days=expire_days)
+    now = int(time.time())
 
     payload = {
         "sub": str(user_id),
         "type": "refresh",
-        "exp": expires,
-        "iat": datetime.utcnow(),
+        "exp": now + expire_days * 86400,
+        "iat": now,
     }
 
-    secret = settings.get_cabinet_jwt_secret()
-    return jwt.encode(payload, secret, algorithm=JWT_ALGORITHM)
+    return _hs256_encode(payload)
 
 
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
@@ -70,8 +144,7 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
         Decoded payload dict or None if invalid/expired
     """
     try:
-        secret = settings.get_cabinet_jwt_secret()
-        return jwt.decode(token, secret, algorithms=[JWT_ALGORITHM])
+        return _JWT.decode(token, _secret_bytes(), algorithms=_JWT_ALGORITHMS)
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
@@ -89,10 +162,27 @@ def get_token_payload(token: str, expected_type: str = "access") -> Optional[Dic
     Returns:
         Decoded payload dict or None if invalid/expired/wrong type
     """
-    payload = decode_token(token)
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _payload_cache.get(cache_key)
 
-    if not payload:
-        return None
+    if payload is None:
+        # Reject tokens of the wrong type before paying for signature verification
+        try:
+            unverified = _JWT.decode(token, options={"verify_signature": False})
+        except jwt.InvalidTokenError:
+            return None
+
+        if unverified.get("type") != expected_type:
+            return None
+
+        payload = decode_token(token)
+
+        if not payload:
+            return None
+
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            _payload_cache.set(cache_key, payload, ttl=exp - time.time())
 
     if payload.get("type") != expected_type:
         return None
@@ -1,13 +1,40 @@
-"""Password hashing utilities using bcrypt."""
+"""Password hashing utilities using Argon2id (bcrypt hashes remain verifiable)."""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+ARGON2_TIME_COST = 2
+ARGON2_MEMORY_COST = 65536  # KiB
+ARGON2_PARALLELISM = 1
+
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+_hasher = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST,
+    parallelism=ARGON2_PARALLELISM,
+)
+
+
+# Argon2 and bcrypt release the GIL, so worker threads hash in parallel across cores.
+# The semaphore bounds how many hashes can queue up behind the pool.
+_HASH_WORKERS = os.cpu_count() or 1
+_hash_pool = ThreadPoolExecutor(max_workers=_HASH_WORKERS, thread_name_prefix="cabinet-hash")
+_hash_slots = asyncio.Semaphore(_HASH_WORKERS * 2)
 
-BCRYPT_ROUNDS = 12
+
+def _is_bcrypt_hash(password_hash: str) -> bool:
+    return password_hash.startswith(_BCRYPT_PREFIXES)
 
 
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt.
+    Hash a password using Argon2id.
 
     Args:
         password: Plain text password
@@ -15,10 +42,7 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
-    password_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode("utf-8")
+    return _hasher.hash(password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
@@ -27,14 +51,47 @@ def verify_password(password: str, password_hash: str) -> bool:
 
     Args:
         password: Plain text password to verify
-        password_hash: Previously hashed password
+        password_hash: Previously hashed password (Argon2id or legacy bcrypt)
 
     Returns:
         True if password matches, False otherwise
     """
     try:
-        password_bytes = password.encode("utf-8")
-        hash_bytes = password_hash.encode("utf-8")
-        return bcrypt.checkpw(password_bytes, hash_bytes)
-    except (ValueError, TypeError):
+        if _is_bcrypt_hash(password_hash):
+            return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+        return _hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError, ValueError, TypeError):
         return False
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    """
+    Check whether a stored hash should be replaced with a current Argon2id hash.
+
+    Args:
+        password_hash: Previously hashed password
+
+    Returns:
+        True for legacy bcrypt hashes and Argon2 hashes with outdated parameters
+    """
+    if _is_bcrypt_hash(password_hash):
+        return True
+    try:
+        return _hasher.check_needs_rehash(password_hash)
+    except (InvalidHashError, ValueError):
+        return True
+
+
+async def _run_in_hash_pool(func, *args):
+    async with _hash_slots:
+        return await asyncio.get_running_loop().run_in_executor(_hash_pool, func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await _run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await _run_in_hash_pool(verify_password, password, password_hash)
@@ -3,11 +3,33 @@
 import hashlib
 import hmac
 import json
+import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from urllib.parse import parse_qsl, unquote
 
 from app.config import settings
+from app.utils.ttl_cache import TTLCache
+
+# Validation results for recently seen initData strings. Mini App clients resend the
+# same initData on every resume; entries never outlive the auth_date window.
+INIT_DATA_CACHE_TTL_SECONDS = 120
+_init_data_cache: TTLCache[tuple, Optional[Dict[str, Any]]] = TTLCache(
+    maxsize=8192,
+    ttl=INIT_DATA_CACHE_TTL_SECONDS,
+)
+_CACHE_MISS = object()
+
+
+@lru_cache(maxsize=4)
+def _widget_secret_key(bot_token: str) -> bytes:
+    return hashlib.sha256(bot_token.encode()).digest()
+
+
+@lru_cache(maxsize=4)
+def _webapp_secret_key(bot_token: str) -> bytes:
+    return hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
 
 
 def validate_telegram_login_widget(data: Dict[str, Any], max_age_seconds: int = 86400) -> bool:
@@ -45,9 +67,8 @@ def validate_telegram_login_widget(data: Dict[str, Any], max_age_seconds: int =
     data_check_arr = [f"{k}={v}" for k, v in sorted(auth_data.items()) if v is not None]
     data_check_string = "\n".join(data_check_arr)
 
-    # Create secret key from bot token using SHA256
-    bot_token = settings.BOT_TOKEN
-    secret_key = hashlib.sha256(bot_token.encode()).digest()
+    # Secret key is SHA256 of the bot token
+    secret_key = _widget_secret_key(settings.BOT_TOKEN)
 
     # Calculate expected hash
     calculated_hash = hmac.new(
@@ -65,6 +86,8 @@ def validate_telegram_init_data(init_data: str, max_age_seconds: int = 86400) ->
 
     https://core.telegram.org/bots/webapps#validating-data-received-via-the-mini-app
 
+    Results are memoized for a short time, keyed by a digest of init_data.
+
     Args:
         init_data: Raw initData string from Telegram WebApp
         max_age_seconds: Maximum allowed age of auth_date (default 24 hours)
@@ -72,6 +95,32 @@ def validate_telegram_init_data(init_data: str, max_age_seconds: int = 86400) ->
     Returns:
         Parsed user data dict if valid, None otherwise
     """
+    cache_key = (
+        hashlib.blake2b(init_data.encode(), digest_size=16).digest(),
+        max_age_seconds,
+        settings.BOT_TOKEN,
+    )
+    cached = _init_data_cache.get(cache_key, _CACHE_MISS)
+    if cached is not _CACHE_MISS:
+        return dict(cached) if cached is not None else None
+
+    result = _validate_telegram_init_data(init_data, max_age_seconds)
+
+    ttl = None
+    if result is not None:
+        # Do not serve a cached success past the auth_date window
+        try:
+            auth_date = int(dict(parse_qsl(init_data)).get("auth_date") or 0)
+        except ValueError:
+            auth_date = 0
+        if auth_date:
+            ttl = auth_date + max_age_seconds - time.time()
+    _init_data_cache.set(cache_key, result, ttl=ttl)
+
+    return dict(result) if result is not None else None
+
+
+def _validate_telegram_init_data(init_data: str, max_age_seconds: int) -> Optional[Dict[str, Any]]:
     try:
         # Parse the init_data string
         parsed = dict(parse_qsl(init_data, keep_blank_values=True))
@@ -96,13 +145,8 @@ def validate_telegram_init_data(init_data: str, max_age_seconds: int = 86400) ->
         data_check_arr = [f"{k}={v}" for k, v in sorted(parsed.items())]
         data_check_string = "\n".join(data_check_arr)
 
-        # Create secret key: HMAC_SHA256(bot_token, "WebAppData")
-        bot_token = settings.BOT_TOKEN
-        secret_key = hmac.new(
-            b"WebAppData",
-            bot_token.encode(),
-            hashlib.sha256
-        ).digest()
+        # Secret key is HMAC_SHA256(bot_token, "WebAppData")
+        secret_key = _webapp_secret_key(settings.BOT_TOKEN)
 
         # Calculate expected hash
         calculated_hash = hmac.new(
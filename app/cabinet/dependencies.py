@@ -1,16 +1,24 @@
 """FastAPI dependencies for cabinet module."""
 
-from fastapi import Depends, HTTPException, status
+import logging
+from functools import lru_cache
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network, ip_address, ip_network
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import FrozenSet, Optional, Tuple, Union
 
 from app.database.database import AsyncSessionLocal
-from app.database.models import User
+from app.database.models import Subscription, User
+from app.database.crud.subscription import check_and_update_subscription_status
 from app.database.crud.user import get_user_by_id
 from app.config import settings
+from app.utils.cache import TokenBucketLimiter
 from .auth.jwt_handler import get_token_payload
 
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer(auto_error=False)
 
 
@@ -114,6 +122,40 @@ async def get_optional_cabinet_user(
     return user
 
 
+async def get_current_subscription(
+    user: User = Depends(get_current_cabinet_user),
+    db: AsyncSession = Depends(get_cabinet_db),
+) -> Optional[Subscription]:
+    """
+    Get the current user's subscription.
+
+    The subscription is eager-loaded with the user, so no extra query is made
+    unless an expired subscription has to be marked as such.
+
+    Args:
+        user: Authenticated User object
+        db: Database session
+
+    Returns:
+        Subscription with an up-to-date status, or None
+    """
+    subscription = user.subscription
+    if subscription:
+        subscription = await check_and_update_subscription_status(db, subscription)
+    return subscription
+
+
+@lru_cache(maxsize=1)
+def _admin_ids_set(raw_admin_ids: str) -> FrozenSet[int]:
+    """Parse ADMIN_IDS once per distinct value, like settings.get_admin_ids()."""
+    if not isinstance(raw_admin_ids, str):
+        return frozenset()
+    try:
+        return frozenset(int(part.strip()) for part in raw_admin_ids.split(",") if part.strip())
+    except ValueError:
+        return frozenset()
+
+
 async def get_current_admin_user(
     user: User = Depends(get_current_cabinet_user),
 ) -> User:
@@ -131,10 +173,88 @@ async def get_current_admin_user(
     Raises:
         HTTPException: If user is not an admin
     """
-    if not settings.is_admin(user.telegram_id):
+    if user.telegram_id not in _admin_ids_set(settings.ADMIN_IDS):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required",
         )
 
     return user
+
+
+@lru_cache(maxsize=1)
+def _trusted_proxy_networks(raw_networks: str) -> Tuple[Union[IPv4Network, IPv6Network], ...]:
+    """Parse CABINET_TRUSTED_PROXY_NETWORKS once per distinct value."""
+    networks = []
+    for part in raw_networks.split(","):
+        candidate = part.strip()
+        if not candidate:
+            continue
+        try:
+            networks.append(ip_network(candidate, strict=False))
+        except ValueError:
+            logger.warning("Invalid cabinet trusted proxy network: %s", candidate)
+    return tuple(networks)
+
+
+def _is_trusted_proxy(ip: Union[IPv4Address, IPv6Address]) -> bool:
+    # Only a proxy on the same host is trusted by default; a docker bridge or LAN
+    # proxy has to be listed in CABINET_TRUSTED_PROXY_NETWORKS (e.g. 172.18.0.0/16)
+    if ip.is_loopback:
+        return True
+    networks = _trusted_proxy_networks(settings.CABINET_TRUSTED_PROXY_NETWORKS or "")
+    return any(ip in network for network in networks)
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Resolve the client address behind trusted reverse proxies.
+
+    X-Forwarded-For is walked from the nearest hop outwards, and the first
+    address that is not a trusted proxy is the client. The header is ignored
+    when the direct peer is not a trusted proxy, so it cannot be spoofed.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Client IP address, or "unknown"
+    """
+    chain = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    if request.client and request.client.host:
+        chain.append(request.client.host)
+
+    client = "unknown"
+    for hop in reversed(chain):
+        try:
+            hop_ip = ip_address(hop)
+        except ValueError:
+            break
+        client = str(hop_ip)
+        if not _is_trusted_proxy(hop_ip):
+            break
+    return client
+
+
+def rate_limit(action: str, capacity: int, period: int):
+    """
+    Build a per-client token-bucket limit dependency.
+
+    Args:
+        action: Bucket name, combined with the client address
+        capacity: Requests allowed in a burst
+        period: Seconds to refill the bucket completely
+
+    Returns:
+        Dependency raising 429 once the client's bucket is empty
+    """
+    async def dependency(request: Request) -> None:
+        client_ip = get_client_ip(request)
+        if not await TokenBucketLimiter.consume(f"cabinet:{action}:{client_ip}", capacity, period):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, try again later",
+                headers={"Retry-After": str(max(1, period // capacity))},
+            )
+
+    return dependency
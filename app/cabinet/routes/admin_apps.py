@@ -1,11 +1,17 @@
 """Admin routes for managing VPN applications in app-config.json."""
 
-import json
+import asyncio
+import copy
 import logging
-from typing import List, Optional, Dict, Any
+import os
+import string
+import time
+from typing import List, Optional, Dict, Any, FrozenSet, Tuple
 from pathlib import Path
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -16,7 +22,11 @@ from ..dependencies import get_cabinet_db, get_current_admin_user
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/admin/apps", tags=["Cabinet Admin Apps"])
+router = APIRouter(
+    prefix="/admin/apps",
+    tags=["Cabinet Admin Apps"],
+    default_response_class=ORJSONResponse,
+)
 
 
 # ============ Schemas ============
@@ -109,51 +119,140 @@ def _get_config_path() -> Path:
     return Path(settings.get_app_config_path())
 
 
-def _load_config() -> dict:
-    """Load app config from file."""
-    config_path = _get_config_path()
-    if not config_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App config file not found: {config_path}",
-        )
+# Parsed config keyed by the file's (path, mtime_ns, size) so unchanged files are not re-read
+_config_cache: Optional[Tuple[Tuple[str, int, int], dict]] = None
+
+
+def _config_fingerprint(config_path: Path) -> Tuple[str, int, int]:
+    stat = config_path.stat()
+    return str(config_path), stat.st_mtime_ns, stat.st_size
+
+
+# Serializes load-modify-save sequences now that file I/O yields to the event loop
+_config_lock = asyncio.Lock()
 
+
+def _read_config_file(config_path: Path) -> dict:
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        return orjson.loads(config_path.read_bytes())
+    except orjson.JSONDecodeError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to parse app config: {e}",
         )
 
 
-def _save_config(config: dict) -> None:
+def _write_config_file(config_path: Path, config: dict) -> None:
+    tmp_path = config_path.with_name(f"{config_path.name}.tmp")
+
+    try:
+        data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        # Write to a sibling file and swap it in so readers never see a truncated config
+        tmp_path.write_bytes(data)
+        try:
+            os.replace(tmp_path, config_path)
+        except OSError:
+            # Bind-mounted single files cannot be replaced, fall back to an in-place write
+            config_path.write_bytes(data)
+            tmp_path.unlink(missing_ok=True)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+async def _load_config(readonly: bool = False) -> dict:
+    """Load app config from file.
+
+    Args:
+        readonly: Return the shared cached dict instead of a private copy.
+            Only pass True when the caller never mutates the result.
+    """
+    global _config_cache
+
+    config_path = _get_config_path()
+    try:
+        fingerprint = _config_fingerprint(config_path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"App config file not found: {config_path}",
+        )
+
+    if _config_cache is None or _config_cache[0] != fingerprint:
+        config = await asyncio.to_thread(_read_config_file, config_path)
+        _config_cache = (fingerprint, config)
+
+    config = _config_cache[1]
+    return config if readonly else copy.deepcopy(config)
+
+
+async def _save_config(config: dict) -> None:
     """Save app config to file."""
+    global _config_cache
+
     config_path = _get_config_path()
 
     try:
-        with open(config_path, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        await asyncio.to_thread(_write_config_file, config_path, config)
     except Exception as e:
+        _config_cache = None
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save app config: {e}",
         )
 
+    _config_cache = (_config_fingerprint(config_path), config)
 
-VALID_PLATFORMS = ["ios", "android", "macos", "windows", "linux", "androidTV", "appleTV"]
 
+def _index_by_id(apps: List[dict]) -> Dict[str, int]:
+    """Map app IDs to their positions in the platform list.
+
+    ``id`` is a required field of AppDefinition, so it is read directly.
+    """
+    return {app["id"]: index for index, app in enumerate(apps)}
+
+
+_BASE36_DIGITS = string.digits + string.ascii_lowercase
+
+
+def _to_base36(value: int) -> str:
+    digits = []
+    while value:
+        value, remainder = divmod(value, 36)
+        digits.append(_BASE36_DIGITS[remainder])
+    return "".join(reversed(digits)) or "0"
+
+
+def _generate_copy_id(app_id: str, taken_ids: FrozenSet[str]) -> str:
+    """Build a unique ID for a copied app, even for copies made in the same second."""
+    counter = time.monotonic_ns()
+    new_id = f"{app_id}-copy-{_to_base36(counter)}"
+    while new_id in taken_ids:
+        counter += 1
+        new_id = f"{app_id}-copy-{_to_base36(counter)}"
+    return new_id
+
+
+PLATFORMS_ORDER = ("ios", "android", "macos", "windows", "linux", "androidTV", "appleTV")
+VALID_PLATFORMS = frozenset(PLATFORMS_ORDER)
+_VALID_PLATFORMS_HINT = f"Valid platforms: {list(PLATFORMS_ORDER)}"
 
-# ============ Routes ============
 
-@router.get("", response_model=AppConfigResponse)
+# ============ Routes ============
+# Stored apps are validated on write (create/update request bodies), so read
+# routes serve the loaded config as-is instead of re-validating it per request.
+
+@router.get(
+    "",
+    response_model=None,
+    responses={200: {"model": AppConfigResponse}},
+)
 async def get_app_config(
     admin: User = Depends(get_current_admin_user),
 ):
     """Get full app configuration."""
-    config = _load_config()
-    return config
+    config = await _load_config(readonly=True)
+    return ORJSONResponse(config)
 
 
 @router.get("/platforms", response_model=List[str])
@@ -161,10 +260,14 @@ async def get_platforms(
     admin: User = Depends(get_current_admin_user),
 ):
     """Get list of available platforms."""
-    return VALID_PLATFORMS
+    return PLATFORMS_ORDER
 
 
-@router.get("/platforms/{platform}", response_model=List[AppDefinition])
+@router.get(
+    "/platforms/{platform}",
+    response_model=None,
+    responses={200: {"model": List[AppDefinition]}},
+)
 async def get_platform_apps(
     platform: str,
     admin: User = Depends(get_current_admin_user),
@@ -173,15 +276,19 @@ async def get_platform_apps(
     if platform not in VALID_PLATFORMS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid platform: {platform}. Valid platforms: {VALID_PLATFORMS}",
+            detail=f"Invalid platform: {platform}. {_VALID_PLATFORMS_HINT}",
         )
 
-    config = _load_config()
+    config = await _load_config(readonly=True)
     platforms = config.get("platforms", {})
-    return platforms.get(platform, [])
+    return ORJSONResponse(platforms.get(platform, []))
 
 
-@router.post("/platforms/{platform}", response_model=AppDefinition)
+@router.post(
+    "/platforms/{platform}",
+    response_model=None,
+    responses={200: {"model": AppDefinition}},
+)
 async def create_app(
     platform: str,
     request: CreateAppRequest,
@@ -194,32 +301,32 @@ async def create_app(
             detail=f"Invalid platform: {platform}",
         )
 
-    config = _load_config()
-    platforms = config.get("platforms", {})
-
-    if platform not in platforms:
-        platforms[platform] = []
+    async with _config_lock:
+        config = await _load_config()
+        apps = config.setdefault("platforms", {}).setdefault(platform, [])
 
-    # Check if app with same ID already exists
-    existing_ids = [app.get("id") for app in platforms[platform]]
-    if request.app.id in existing_ids:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"App with ID '{request.app.id}' already exists in {platform}",
-        )
+        # Check if app with same ID already exists
+        if request.app.id in _index_by_id(apps):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"App with ID '{request.app.id}' already exists in {platform}",
+            )
 
-    # Add new app
-    app_dict = request.app.model_dump(exclude_none=True)
-    platforms[platform].append(app_dict)
-    config["platforms"] = platforms
+        # Add new app
+        app_dict = request.app.model_dump(mode="json", exclude_none=True)
+        apps.append(app_dict)
 
-    _save_config(config)
+        await _save_config(config)
     logger.info(f"Admin {admin.id} created app '{request.app.id}' for platform '{platform}'")
 
     return request.app
 
 
-@router.put("/platforms/{platform}/{app_id}", response_model=AppDefinition)
+@router.put(
+    "/platforms/{platform}/{app_id}",
+    response_model=None,
+    responses={200: {"model": AppDefinition}},
+)
 async def update_app(
     platform: str,
     app_id: str,
@@ -233,30 +340,25 @@ async def update_app(
             detail=f"Invalid platform: {platform}",
         )
 
-    config = _load_config()
-    platforms = config.get("platforms", {})
-    apps = platforms.get(platform, [])
+    async with _config_lock:
+        config = await _load_config()
+        platforms = config.get("platforms", {})
+        apps = platforms.get(platform, [])
 
-    # Find and update app
-    app_index = None
-    for i, app in enumerate(apps):
-        if app.get("id") == app_id:
-            app_index = i
-            break
+        # Find and update app
+        app_index = _index_by_id(apps).get(app_id)
 
-    if app_index is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App '{app_id}' not found in platform '{platform}'",
-        )
+        if app_index is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"App '{app_id}' not found in platform '{platform}'",
+            )
 
-    # Update app
-    app_dict = request.app.model_dump(exclude_none=True)
-    apps[app_index] = app_dict
-    platforms[platform] = apps
-    config["platforms"] = platforms
+        # Update app
+        app_dict = request.app.model_dump(mode="json", exclude_none=True)
+        apps[app_index] = app_dict
 
-    _save_config(config)
+        await _save_config(config)
     logger.info(f"Admin {admin.id} updated app '{app_id}' in platform '{platform}'")
 
     return request.app
@@ -275,24 +377,23 @@ async def delete_app(
             detail=f"Invalid platform: {platform}",
         )
 
-    config = _load_config()
-    platforms = config.get("platforms", {})
-    apps = platforms.get(platform, [])
+    async with _config_lock:
+        config = await _load_config()
+        platforms = config.get("platforms", {})
+        apps = platforms.get(platform, [])
 
-    # Find and remove app
-    original_length = len(apps)
-    apps = [app for app in apps if app.get("id") != app_id]
+        # Find and remove app
+        app_index = _index_by_id(apps).get(app_id)
 
-    if len(apps) == original_length:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App '{app_id}' not found in platform '{platform}'",
-        )
+        if app_index is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"App '{app_id}' not found in platform '{platform}'",
+            )
 
-    platforms[platform] = apps
-    config["platforms"] = platforms
+        apps.pop(app_index)
 
-    _save_config(config)
+        await _save_config(config)
     logger.info(f"Admin {admin.id} deleted app '{app_id}' from platform '{platform}'")
 
     return {"status": "deleted", "app_id": app_id}
@@ -311,33 +412,34 @@ async def reorder_apps(
             detail=f"Invalid platform: {platform}",
         )
 
-    config = _load_config()
-    platforms = config.get("platforms", {})
-    apps = platforms.get(platform, [])
+    async with _config_lock:
+        config = await _load_config()
+        platforms = config.get("platforms", {})
+        apps = platforms.get(platform, [])
 
-    # Create a map of apps by ID
-    apps_map = {app.get("id"): app for app in apps}
+        # Create a map of apps by ID
+        apps_map = {app["id"]: app for app in apps}
 
-    # Verify all IDs exist
-    for app_id in request.app_ids:
-        if app_id not in apps_map:
+        # Verify all IDs exist
+        requested_ids = set(request.app_ids)
+        missing_ids = requested_ids - apps_map.keys()
+        if missing_ids:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"App '{app_id}' not found in platform '{platform}'",
+                detail=f"Apps {sorted(missing_ids)} not found in platform '{platform}'",
             )
 
-    # Reorder apps
-    reordered_apps = [apps_map[app_id] for app_id in request.app_ids]
+        # Reorder apps
+        reordered_apps = [apps_map[app_id] for app_id in request.app_ids]
 
-    # Add any apps that weren't in the reorder list (shouldn't happen but just in case)
-    for app in apps:
-        if app.get("id") not in request.app_ids:
-            reordered_apps.append(app)
+        # Add any apps that weren't in the reorder list (shouldn't happen but just in case)
+        reordered_apps.extend(
+            app for app_id, app in apps_map.items() if app_id not in requested_ids
+        )
 
-    platforms[platform] = reordered_apps
-    config["platforms"] = platforms
+        apps[:] = reordered_apps
 
-    _save_config(config)
+        await _save_config(config)
     logger.info(f"Admin {admin.id} reordered apps in platform '{platform}'")
 
     return {"status": "reordered", "order": request.app_ids}
@@ -349,14 +451,15 @@ async def update_branding(
     admin: User = Depends(get_current_admin_user),
 ):
     """Update branding configuration."""
-    config = _load_config()
+    async with _config_lock:
+        config = await _load_config()
 
-    if "config" not in config:
-        config["config"] = {}
+        if "config" not in config:
+            config["config"] = {}
 
-    config["config"]["branding"] = request.branding.model_dump()
+        config["config"]["branding"] = request.branding.model_dump()
 
-    _save_config(config)
+        await _save_config(config)
     logger.info(f"Admin {admin.id} updated branding")
 
     return request.branding
@@ -367,7 +470,7 @@ async def get_branding(
     admin: User = Depends(get_current_admin_user),
 ):
     """Get branding configuration."""
-    config = _load_config()
+    config = await _load_config(readonly=True)
     branding = config.get("config", {}).get("branding", {})
     return branding
 
@@ -380,42 +483,39 @@ async def copy_app_to_platform(
     admin: User = Depends(get_current_admin_user),
 ):
     """Copy an app from one platform to another."""
-    if platform not in VALID_PLATFORMS or target_platform not in VALID_PLATFORMS:
+    if not (platform in VALID_PLATFORMS and target_platform in VALID_PLATFORMS):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid platform(s)",
         )
 
-    config = _load_config()
-    platforms = config.get("platforms", {})
-    source_apps = platforms.get(platform, [])
+    async with _config_lock:
+        config = await _load_config()
+        platforms = config.setdefault("platforms", {})
+        source_apps = platforms.get(platform, [])
 
-    # Find source app
-    source_app = None
-    for app in source_apps:
-        if app.get("id") == app_id:
-            source_app = app.copy()
-            break
+        # Find source app
+        source_index = _index_by_id(source_apps).get(app_id)
 
-    if not source_app:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App '{app_id}' not found in platform '{platform}'",
-        )
+        if source_index is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"App '{app_id}' not found in platform '{platform}'",
+            )
+
+        # Round-trip through JSON so nested steps and buttons are not shared with the source
+        source_app = orjson.loads(orjson.dumps(source_apps[source_index]))
 
-    # Generate new ID for copied app
-    import time
-    new_id = f"{app_id}-copy-{int(time.time())}"
-    source_app["id"] = new_id
+        target_apps = platforms.setdefault(target_platform, [])
 
-    # Add to target platform
-    if target_platform not in platforms:
-        platforms[target_platform] = []
+        # Generate new ID for copied app
+        new_id = _generate_copy_id(app_id, frozenset(app["id"] for app in target_apps))
+        source_app["id"] = new_id
 
-    platforms[target_platform].append(source_app)
-    config["platforms"] = platforms
+        # Add to target platform
+        target_apps.append(source_app)
 
-    _save_config(config)
+        await _save_config(config)
     logger.info(f"Admin {admin.id} copied app '{app_id}' from '{platform}' to '{target_platform}' as '{new_id}'")
 
     return {"status": "copied", "new_id": new_id, "target_platform": target_platform}
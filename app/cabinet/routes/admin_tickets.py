@@ -1,19 +1,25 @@
 """Admin tickets routes for cabinet."""
 
+import base64
+import binascii
 import logging
-import math
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import orjson
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
-from sqlalchemy.orm import selectinload
-from pydantic import BaseModel, Field
+from sqlalchemy import select, insert, update, func, desc, tuple_
+from sqlalchemy.orm import raiseload, selectinload
+from pydantic import BaseModel, Field, field_validator
 
+from app.database.database import AsyncSessionLocal
 from app.database.models import User, Ticket, TicketMessage
 from app.database.crud.ticket import TicketCRUD, TicketMessageCRUD
 from app.config import settings
+from app.utils.ttl_cache import TTLCache
 
 from ..dependencies import get_cabinet_db, get_current_admin_user
 from ..schemas.tickets import TicketMessageResponse
@@ -22,6 +28,24 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/admin/tickets", tags=["Cabinet Admin Tickets"])
 
+# Ticket list totals keyed by (status, priority) filters. Small totals are cheap to
+# count and are not cached so short lists stay exact.
+TICKET_COUNT_CACHE_TTL_SECONDS = 15
+TICKET_COUNT_CACHE_MIN_TOTAL = 1000
+_ticket_count_cache: TTLCache[tuple, int] = TTLCache(
+    maxsize=64,
+    ttl=TICKET_COUNT_CACHE_TTL_SECONDS,
+)
+
+# Admin-wide status counters polled by dashboards; dropped on every ticket mutation.
+TICKET_STATS_CACHE_TTL_SECONDS = 10
+_ticket_stats_cache: TTLCache[str, dict] = TTLCache(maxsize=1, ttl=TICKET_STATS_CACHE_TTL_SECONDS)
+
+ALLOWED_STATUSES = frozenset({"open", "pending", "answered", "closed"})
+ALLOWED_PRIORITIES = frozenset({"low", "normal", "high", "urgent"})
+_ALLOWED_STATUSES_HINT = ", ".join(sorted(ALLOWED_STATUSES))
+_ALLOWED_PRIORITIES_HINT = ", ".join(sorted(ALLOWED_PRIORITIES))
+
 
 # Admin-specific schemas
 class AdminTicketUserInfo(BaseModel):
@@ -77,6 +101,7 @@ class AdminTicketListResponse(BaseModel):
     page: int
     per_page: int
     pages: int
+    next_cursor: Optional[str] = None
 
 
 class AdminReplyRequest(BaseModel):
@@ -88,11 +113,25 @@ class AdminStatusUpdateRequest(BaseModel):
     """Update ticket status."""
     status: str = Field(..., description="New status: open, answered, pending, closed")
 
+    @field_validator("status")
+    @classmethod
+    def validate_status(cls, v: str) -> str:
+        if v not in ALLOWED_STATUSES:
+            raise ValueError(f"Invalid status. Allowed: {_ALLOWED_STATUSES_HINT}")
+        return v
+
 
 class AdminPriorityUpdateRequest(BaseModel):
     """Update ticket priority."""
     priority: str = Field(..., description="New priority: low, normal, high, urgent")
 
+    @field_validator("priority")
+    @classmethod
+    def validate_priority(cls, v: str) -> str:
+        if v not in ALLOWED_PRIORITIES:
+            raise ValueError(f"Invalid priority. Allowed: {_ALLOWED_PRIORITIES_HINT}")
+        return v
+
 
 class AdminStatsResponse(BaseModel):
     """Ticket statistics for admin."""
@@ -103,101 +142,254 @@ class AdminStatsResponse(BaseModel):
     closed: int
 
 
-def _message_to_response(message: TicketMessage) -> TicketMessageResponse:
-    """Convert TicketMessage to response."""
-    return TicketMessageResponse(
-        id=message.id,
-        message_text=message.message_text or "",
-        is_from_admin=message.is_from_admin,
-        has_media=bool(message.media_file_id),
-        media_type=message.media_type,
-        media_caption=message.media_caption,
-        created_at=message.created_at,
-    )
+def _invalidate_ticket_caches() -> None:
+    """Drop cached totals and stats after a ticket mutation."""
+    _ticket_count_cache.clear()
+    _ticket_stats_cache.pop("stats")
+
+
+def _encode_cursor(ticket: Ticket) -> str:
+    """Encode the (updated_at, id) position of a ticket as an opaque cursor."""
+    raw = orjson.dumps([ticket.updated_at.isoformat(), ticket.id])
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        updated_at, ticket_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(updated_at), int(ticket_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
 
-def _user_to_info(user: User) -> AdminTicketUserInfo:
-    """Convert User to admin info."""
-    return AdminTicketUserInfo(
-        id=user.id,
-        telegram_id=user.telegram_id,
-        username=user.username,
-        first_name=user.first_name,
-        last_name=user.last_name,
+def _ticket_load_options(*options):
+    """Eager-load options for Ticket queries.
+
+    With DEBUG enabled any relationship that is not loaded explicitly raises
+    on access instead of silently issuing an extra query.
+    """
+    if settings.DEBUG:
+        return (*options, raiseload("*"))
+    return options
+
+
+def _build_detail_response(ticket: Ticket) -> dict:
+    """Build an AdminTicketDetailResponse payload; messages arrive ordered by the relationship."""
+    return {
+        "id": ticket.id,
+        "title": ticket.title or f"Ticket #{ticket.id}",
+        "status": ticket.status,
+        "priority": ticket.priority or "normal",
+        "created_at": ticket.created_at,
+        "updated_at": ticket.updated_at or ticket.created_at,
+        "closed_at": ticket.closed_at,
+        "is_reply_blocked": ticket.is_reply_blocked if hasattr(ticket, "is_reply_blocked") else False,
+        "user": _user_dict(ticket.user) if ticket.user else None,
+        "messages": list(map(_msg_dict, ticket.messages or ())),
+    }
+
+
+async def _update_ticket_or_404(db: AsyncSession, ticket_id: int, **values) -> None:
+    """Apply column updates with a single UPDATE ... RETURNING and commit."""
+    result = await db.execute(
+        update(Ticket)
+        .where(Ticket.id == ticket_id)
+        .values(**values)
+        .returning(Ticket.id)
+        .execution_options(synchronize_session=False)
     )
 
+    if result.scalar_one_or_none() is None:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ticket not found",
+        )
+
+    await db.commit()
+    _invalidate_ticket_caches()
+
 
-def _ticket_to_admin_response(ticket: Ticket, include_messages: bool = False) -> AdminTicketResponse:
-    """Convert Ticket to admin response."""
-    last_message = None
-    messages_count = len(ticket.messages) if ticket.messages else 0
-
-    if ticket.messages:
-        last_msg = max(ticket.messages, key=lambda m: m.created_at)
-        last_message = _message_to_response(last_msg)
-
-    user_info = None
-    if hasattr(ticket, 'user') and ticket.user:
-        user_info = _user_to_info(ticket.user)
-
-    return AdminTicketResponse(
-        id=ticket.id,
-        title=ticket.title or f"Ticket #{ticket.id}",
-        status=ticket.status,
-        priority=ticket.priority or "normal",
-        created_at=ticket.created_at,
-        updated_at=ticket.updated_at or ticket.created_at,
-        closed_at=ticket.closed_at,
-        messages_count=messages_count,
-        user=user_info,
-        last_message=last_message,
+async def _get_ticket_with_messages(db: AsyncSession, ticket_id: int) -> Ticket:
+    """Load a ticket together with its messages and author."""
+    result = await db.execute(
+        select(Ticket)
+        .where(Ticket.id == ticket_id)
+        .options(*_ticket_load_options(selectinload(Ticket.messages), selectinload(Ticket.user)))
     )
+    ticket = result.scalar_one_or_none()
+
+    if not ticket:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ticket not found",
+        )
+
+    return ticket
+
 
+async def _notify_user_about_reply(bot, ticket_id: int, reply_text: str) -> None:
+    """Send the Telegram reply notification using its own DB session.
 
-@router.get("/stats", response_model=AdminStatsResponse)
+    Reuses the application bot when available; a temporary bot is only created
+    when the cabinet runs without one.
+    """
+    own_bot = None
+    try:
+        from app.handlers.admin.tickets import notify_user_about_ticket_reply
+
+        if bot is None:
+            from aiogram import Bot
+            from aiogram.client.default import DefaultBotProperties
+            from aiogram.enums import ParseMode
+
+            bot = own_bot = Bot(
+                token=settings.BOT_TOKEN,
+                default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+            )
+
+        async with AsyncSessionLocal() as session:
+            ticket = await TicketCRUD.get_ticket_by_id(
+                session, ticket_id, load_messages=False, load_user=True
+            )
+            if not ticket:
+                return
+            await notify_user_about_ticket_reply(bot, ticket, reply_text, session)
+    except Exception as e:
+        logger.warning(f"Failed to notify user about ticket reply: {e}")
+    finally:
+        if own_bot is not None:
+            await own_bot.session.close()
+
+
+def _json_response(payload: dict) -> ORJSONResponse:
+    """Serialize a payload built from trusted DB data without FastAPI re-validation.
+
+    The pydantic schemas only document the shape in OpenAPI.
+    """
+    return ORJSONResponse(content=payload)
+
+
+def _msg_dict(message: TicketMessage) -> dict:
+    """Build a TicketMessageResponse payload."""
+    return {
+        "id": message.id,
+        "message_text": message.message_text or "",
+        "is_from_admin": message.is_from_admin,
+        "has_media": bool(message.media_file_id),
+        "media_type": message.media_type,
+        "media_caption": message.media_caption,
+        "created_at": message.created_at,
+    }
+
+
+def _user_dict(user: User) -> dict:
+    """Build an AdminTicketUserInfo payload."""
+    return {
+        "id": user.id,
+        "telegram_id": user.telegram_id,
+        "username": user.username,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+    }
+
+
+def _ticket_dict(
+    ticket: Ticket,
+    messages_count: int = 0,
+    last_message: Optional[TicketMessage] = None,
+) -> dict:
+    """Build an AdminTicketResponse payload using precomputed message aggregates."""
+    return {
+        "id": ticket.id,
+        "title": ticket.title or f"Ticket #{ticket.id}",
+        "status": ticket.status,
+        "priority": ticket.priority or "normal",
+        "created_at": ticket.created_at,
+        "updated_at": ticket.updated_at or ticket.created_at,
+        "closed_at": ticket.closed_at,
+        "messages_count": messages_count or 0,
+        "user": _user_dict(ticket.user) if ticket.user else None,
+        "last_message": _msg_dict(last_message) if last_message else None,
+    }
+
+
+@router.get(
+    "/stats",
+    response_model=None,
+    responses={200: {"model": AdminStatsResponse}},
+)
 async def get_ticket_stats(
     admin: User = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get ticket statistics."""
-    # Total count
-    total_result = await db.execute(select(func.count()).select_from(Ticket))
-    total = total_result.scalar() or 0
-
-    # Count by status
-    statuses = {}
-    for status_name in ["open", "pending", "answered", "closed"]:
+    stats = _ticket_stats_cache.get("stats")
+    if stats is None:
         result = await db.execute(
-            select(func.count()).select_from(Ticket).where(Ticket.status == status_name)
+            select(Ticket.status, func.count()).group_by(Ticket.status)
         )
-        statuses[status_name] = result.scalar() or 0
-
-    return AdminStatsResponse(
-        total=total,
-        open=statuses.get("open", 0),
-        pending=statuses.get("pending", 0),
-        answered=statuses.get("answered", 0),
-        closed=statuses.get("closed", 0),
-    )
+        statuses = {status_name: count for status_name, count in result.all()}
 
+        stats = {
+            "total": sum(statuses.values()),
+            "open": statuses.get("open", 0),
+            "pending": statuses.get("pending", 0),
+            "answered": statuses.get("answered", 0),
+            "closed": statuses.get("closed", 0),
+        }
+        _ticket_stats_cache.set("stats", stats)
 
-@router.get("", response_model=AdminTicketListResponse)
+    return _json_response(stats)
+
+
+@router.get(
+    "",
+    response_model=None,
+    responses={200: {"model": AdminTicketListResponse}},
+)
 async def get_all_tickets(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
     priority_filter: Optional[str] = Query(None, alias="priority", description="Filter by priority"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous response's next_cursor; takes precedence over page",
+    ),
     admin: User = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
-    """Get all tickets for admin."""
+    """Get all tickets for admin.
+
+    Prefer ``cursor`` pagination: deep pages are served by an index seek
+    instead of scanning and discarding ``(page - 1) * per_page`` rows.
+    """
+    # Per-ticket message aggregates are computed in SQL instead of loading every message
+    messages_count = (
+        select(func.count(TicketMessage.id))
+        .where(TicketMessage.ticket_id == Ticket.id)
+        .correlate(Ticket)
+        .scalar_subquery()
+    )
+    last_message_id = (
+        select(func.max(TicketMessage.id))
+        .where(TicketMessage.ticket_id == Ticket.id)
+        .correlate(Ticket)
+        .scalar_subquery()
+    )
+
     # Base query with user relationship
     query = (
-        select(Ticket)
-        .options(selectinload(Ticket.messages), selectinload(Ticket.user))
+        select(Ticket, messages_count, last_message_id)
+        .options(*_ticket_load_options(selectinload(Ticket.user)))
     )
 
-    # Build count query
+    # Count query, used when the total cannot come from the page itself
     count_query = select(func.count()).select_from(Ticket)
 
     # Apply filters
@@ -209,130 +401,153 @@ async def get_all_tickets(
         query = query.where(Ticket.priority == priority_filter)
         count_query = count_query.where(Ticket.priority == priority_filter)
 
-    # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    # Paginate - order by updated_at desc (newest first), id breaks ties
+    query = query.order_by(desc(Ticket.updated_at), desc(Ticket.id)).limit(per_page)
+    if cursor:
+        cursor_updated_at, cursor_id = _decode_cursor(cursor)
+        query = query.where(
+            tuple_(Ticket.updated_at, Ticket.id) < tuple_(cursor_updated_at, cursor_id)
+        )
+    else:
+        query = query.offset((page - 1) * per_page)
 
-    # Paginate - order by updated_at desc (newest first)
-    offset = (page - 1) * per_page
-    query = query.order_by(desc(Ticket.updated_at)).offset(offset).limit(per_page)
+    # Without a cached total, offset pages get it from a window count on the
+    # same query; cursor pages are already narrowed and need a separate COUNT.
+    count_key = (status_filter, priority_filter)
+    total = _ticket_count_cache.get(count_key)
+    with_window_total = total is None and not cursor
+    if with_window_total:
+        query = query.add_columns(func.count().over())
 
     result = await db.execute(query)
-    tickets = result.scalars().all()
-
-    items = [_ticket_to_admin_response(t) for t in tickets]
-    pages = math.ceil(total / per_page) if total > 0 else 1
-
-    return AdminTicketListResponse(
-        items=items,
-        total=total,
-        page=page,
-        per_page=per_page,
-        pages=pages,
-    )
-
-
-@router.get("/{ticket_id}", response_model=AdminTicketDetailResponse)
+    rows = result.all()
+
+    if total is None:
+        if with_window_total and rows:
+            total = rows[0][3]
+        else:
+            total_result = await db.execute(count_query)
+            total = total_result.scalar() or 0
+        if total >= TICKET_COUNT_CACHE_MIN_TOTAL:
+            _ticket_count_cache.set(count_key, total)
+
+    tickets = [row[0] for row in rows]
+
+    # Load only the newest message of each ticket on the page, in one query
+    last_message_ids = [row[2] for row in rows if row[2] is not None]
+    last_messages = {}
+    if last_message_ids:
+        messages_result = await db.execute(
+            select(TicketMessage).where(TicketMessage.id.in_(last_message_ids))
+        )
+        last_messages = {m.id: m for m in messages_result.scalars().all()}
+
+    items = [
+        _ticket_dict(ticket, count, last_messages.get(last_id))
+        for ticket, count, last_id, *_ in rows
+    ]
+    pages = -(-total // per_page) if total > 0 else 1
+
+    next_cursor = None
+    if len(tickets) == per_page and tickets[-1].updated_at is not None:
+        next_cursor = _encode_cursor(tickets[-1])
+
+    return _json_response({
+        "items": items,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "pages": pages,
+        "next_cursor": next_cursor,
+    })
+
+
+@router.get(
+    "/{ticket_id}",
+    response_model=None,
+    responses={200: {"model": AdminTicketDetailResponse}},
+)
 async def get_ticket_detail(
     ticket_id: int,
     admin: User = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get ticket with all messages for admin."""
-    query = (
-        select(Ticket)
-        .where(Ticket.id == ticket_id)
-        .options(selectinload(Ticket.messages), selectinload(Ticket.user))
-    )
+    ticket = await _get_ticket_with_messages(db, ticket_id)
+    return _json_response(_build_detail_response(ticket))
 
-    result = await db.execute(query)
-    ticket = result.scalar_one_or_none()
 
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket not found",
-        )
-
-    messages = sorted(ticket.messages or [], key=lambda m: m.created_at)
-    messages_response = [_message_to_response(m) for m in messages]
-
-    user_info = None
-    if ticket.user:
-        user_info = _user_to_info(ticket.user)
-
-    return AdminTicketDetailResponse(
-        id=ticket.id,
-        title=ticket.title or f"Ticket #{ticket.id}",
-        status=ticket.status,
-        priority=ticket.priority or "normal",
-        created_at=ticket.created_at,
-        updated_at=ticket.updated_at or ticket.created_at,
-        closed_at=ticket.closed_at,
-        is_reply_blocked=ticket.is_reply_blocked if hasattr(ticket, "is_reply_blocked") else False,
-        user=user_info,
-        messages=messages_response,
-    )
-
-
-@router.post("/{ticket_id}/reply", response_model=TicketMessageResponse)
+@router.post(
+    "/{ticket_id}/reply",
+    response_model=None,
+    responses={200: {"model": TicketMessageResponse}},
+)
 async def reply_to_ticket(
     ticket_id: int,
     request: AdminReplyRequest,
+    http_request: Request,
+    background_tasks: BackgroundTasks,
     admin: User = Depends(get_current_admin_user),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Reply to a ticket as admin."""
-    # Get ticket
-    ticket = await TicketCRUD.get_ticket_by_id(db, ticket_id, load_messages=False, load_user=True)
+    # Mark the ticket answered; RETURNING user_id doubles as the existence check
+    result = await db.execute(
+        update(Ticket)
+        .where(Ticket.id == ticket_id)
+        .values(status="answered", updated_at=func.now())
+        .returning(Ticket.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    ticket_user_id = result.scalar_one_or_none()
 
-    if not ticket:
+    if ticket_user_id is None:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket not found",
         )
 
-    # Create admin message
-    message = TicketMessage(
-        ticket_id=ticket.id,
-        user_id=ticket.user_id,
-        message_text=request.message,
-        is_from_admin=True,
-        created_at=datetime.utcnow(),
+    # Create admin message in the same transaction
+    result = await db.execute(
+        insert(TicketMessage)
+        .values(
+            ticket_id=ticket_id,
+            user_id=ticket_user_id,
+            message_text=request.message,
+            is_from_admin=True,
+        )
+        .returning(TicketMessage.id, TicketMessage.created_at)
     )
-    db.add(message)
-
-    # Update ticket status to answered
-    ticket.status = "answered"
-    ticket.updated_at = datetime.utcnow()
+    message_id, created_at = result.one()
 
     await db.commit()
-    await db.refresh(message)
-
-    # Try to notify user via Telegram
-    try:
-        from aiogram import Bot
-        from aiogram.client.default import DefaultBotProperties
-        from aiogram.enums import ParseMode
-
-        bot = Bot(
-            token=settings.BOT_TOKEN,
-            default=DefaultBotProperties(parse_mode=ParseMode.HTML),
-        )
-        try:
-            from app.handlers.admin.tickets import notify_user_about_ticket_reply
-            await notify_user_about_ticket_reply(bot, ticket, request.message, db)
-        except Exception as e:
-            logger.warning(f"Failed to notify user about ticket reply: {e}")
-        finally:
-            await bot.session.close()
-    except Exception as e:
-        logger.warning(f"Failed to send Telegram notification: {e}")
-
-    return _message_to_response(message)
-
+    _invalidate_ticket_caches()
+
+    # Notify user via Telegram after the response has been sent
+    background_tasks.add_task(
+        _notify_user_about_reply,
+        getattr(http_request.app.state, "bot", None),
+        ticket_id,
+        request.message,
+    )
 
-@router.post("/{ticket_id}/status", response_model=AdminTicketDetailResponse)
+    return _json_response({
+        "id": message_id,
+        "message_text": request.message,
+        "is_from_admin": True,
+        "has_media": False,
+        "media_type": None,
+        "media_caption": None,
+        "created_at": created_at,
+    })
+
+
+@router.post(
+    "/{ticket_id}/status",
+    response_model=None,
+    responses={200: {"model": AdminTicketDetailResponse}},
+)
 async def update_ticket_status(
     ticket_id: int,
     request: AdminStatusUpdateRequest,
@@ -340,60 +555,23 @@ async def update_ticket_status(
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Update ticket status."""
-    allowed_statuses = {"open", "pending", "answered", "closed"}
-    if request.status not in allowed_statuses:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Allowed: {', '.join(allowed_statuses)}",
-        )
-
-    query = (
-        select(Ticket)
-        .where(Ticket.id == ticket_id)
-        .options(selectinload(Ticket.messages), selectinload(Ticket.user))
+    await _update_ticket_or_404(
+        db,
+        ticket_id,
+        status=request.status,
+        updated_at=func.now(),
+        closed_at=func.now() if request.status == "closed" else None,
     )
+    ticket = await _get_ticket_with_messages(db, ticket_id)
 
-    result = await db.execute(query)
-    ticket = result.scalar_one_or_none()
+    return _json_response(_build_detail_response(ticket))
 
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket not found",
-        )
 
-    ticket.status = request.status
-    ticket.updated_at = datetime.utcnow()
-    if request.status == "closed":
-        ticket.closed_at = datetime.utcnow()
-    else:
-        ticket.closed_at = None
-
-    await db.commit()
-    await db.refresh(ticket)
-
-    messages = sorted(ticket.messages or [], key=lambda m: m.created_at)
-    messages_response = [_message_to_response(m) for m in messages]
-
-    user_info = None
-    if ticket.user:
-        user_info = _user_to_info(ticket.user)
-
-    return AdminTicketDetailResponse(
-        id=ticket.id,
-        title=ticket.title or f"Ticket #{ticket.id}",
-        status=ticket.status,
-        priority=ticket.priority or "normal",
-        created_at=ticket.created_at,
-        updated_at=ticket.updated_at or ticket.created_at,
-        closed_at=ticket.closed_at,
-        is_reply_blocked=ticket.is_reply_blocked if hasattr(ticket, "is_reply_blocked") else False,
-        user=user_info,
-        messages=messages_response,
-    )
-
-
-@router.post("/{ticket_id}/priority", response_model=AdminTicketDetailResponse)
+@router.post(
+    "/{ticket_id}/priority",
+    response_model=None,
+    responses={200: {"model": AdminTicketDetailResponse}},
+)
 async def update_ticket_priority(
     ticket_id: int,
     request: AdminPriorityUpdateRequest,
@@ -401,50 +579,12 @@ async def update_ticket_priority(
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Update ticket priority."""
-    allowed_priorities = {"low", "normal", "high", "urgent"}
-    if request.priority not in allowed_priorities:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid priority. Allowed: {', '.join(allowed_priorities)}",
-        )
-
-    query = (
-        select(Ticket)
-        .where(Ticket.id == ticket_id)
-        .options(selectinload(Ticket.messages), selectinload(Ticket.user))
+    await _update_ticket_or_404(
+        db,
+        ticket_id,
+        priority=request.priority,
+        updated_at=func.now(),
     )
+    ticket = await _get_ticket_with_messages(db, ticket_id)
 
-    result = await db.execute(query)
-    ticket = result.scalar_one_or_none()
-
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket not found",
-        )
-
-    ticket.priority = request.priority
-    ticket.updated_at = datetime.utcnow()
-
-    await db.commit()
-    await db.refresh(ticket)
-
-    messages = sorted(ticket.messages or [], key=lambda m: m.created_at)
-    messages_response = [_message_to_response(m) for m in messages]
-
-    user_info = None
-    if ticket.user:
-        user_info = _user_to_info(ticket.user)
-
-    return AdminTicketDetailResponse(
-        id=ticket.id,
-        title=ticket.title or f"Ticket #{ticket.id}",
-        status=ticket.status,
-        priority=ticket.priority or "normal",
-        created_at=ticket.created_at,
-        updated_at=ticket.updated_at or ticket.created_at,
-        closed_at=ticket.closed_at,
-        is_reply_blocked=ticket.is_reply_blocked if hasattr(ticket, "is_reply_blocked") else False,
-        user=user_info,
-        messages=messages_response,
-    )
+    return _json_response(_build_detail_response(ticket))
@@ -3,17 +3,20 @@
 import hashlib
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, exists, func, lambda_stmt, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
 
 from app.database.models import User, CabinetRefreshToken
-from app.database.crud.user import get_user_by_telegram_id, get_user_by_id, create_user
+from app.database.crud.user import create_user
 from app.config import settings
 
-from ..dependencies import get_cabinet_db, get_current_cabinet_user
+from ..dependencies import get_cabinet_db, get_current_cabinet_user, rate_limit
 from ..schemas.auth import (
     TelegramAuthRequest,
     TelegramWidgetAuthRequest,
@@ -33,27 +36,114 @@ from ..auth import (
     create_access_token,
     create_refresh_token,
     get_token_payload,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
 )
-from ..auth.jwt_handler import get_refresh_token_expires_at
+from ..auth.jwt_handler import get_refresh_token_expires_at, refresh_token_fingerprint
 from ..auth.email_verification import (
     generate_verification_token,
     generate_password_reset_token,
+    hash_email_token,
     get_verification_expires_at,
     get_password_reset_expires_at,
     is_token_expired,
 )
 from ..services.email_service import email_service
+from ..services.email_queue_service import (
+    EMAIL_KIND_PASSWORD_RESET,
+    EMAIL_KIND_VERIFICATION,
+    email_queue_service,
+)
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/auth", tags=["Cabinet Auth"])
+router = APIRouter(
+    prefix="/auth",
+    tags=["Cabinet Auth"],
+    default_response_class=ORJSONResponse,
+)
+
+# Hot lookups built once; lambda statements skip per-call statement construction
+# and reuse the compiled SQL from the engine's statement cache.
+_SELECT_USER_BY_TELEGRAM_ID = lambda_stmt(
+    lambda: select(User).where(User.telegram_id == bindparam("telegram_id"))
+)
+_SELECT_USER_BY_EMAIL = lambda_stmt(
+    lambda: select(User).where(User.email == bindparam("email"))
+)
+_SELECT_USER_BY_VERIFICATION_TOKEN = lambda_stmt(
+    lambda: select(User).where(User.email_verification_token == bindparam("token_hash"))
+)
+_SELECT_USER_BY_RESET_TOKEN = lambda_stmt(
+    lambda: select(User).where(User.password_reset_token == bindparam("token_hash"))
+)
+_SELECT_REFRESH_TOKEN = lambda_stmt(
+    lambda: select(CabinetRefreshToken).where(
+        CabinetRefreshToken.token_hash.in_(bindparam("token_hashes", expanding=True))
+    )
+)
+# The owner's status and telegram_id come back with the token in the same round trip
+_SELECT_ACTIVE_REFRESH_TOKEN_WITH_USER = lambda_stmt(
+    lambda: select(CabinetRefreshToken, User.telegram_id, User.status)
+    .join(User, User.id == CabinetRefreshToken.user_id)
+    .where(
+        CabinetRefreshToken.token_hash.in_(bindparam("token_hashes", expanding=True)),
+        CabinetRefreshToken.user_id == bindparam("user_id"),
+        CabinetRefreshToken.revoked_at.is_(None),
+    )
+)
+
+
+def _legacy_token_digest(token: str) -> str:
+    """SHA-256 lookup key used for refresh tokens stored before keyed fingerprints."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _token_hash_candidates(token: str) -> Tuple[str, str]:
+    """Current and legacy lookup keys; old rows are rehashed on their next refresh."""
+    return refresh_token_fingerprint(token), _legacy_token_digest(token)
+
+
+_EMAIL_SENDERS = {
+    EMAIL_KIND_VERIFICATION: email_service.send_verification_email,
+    EMAIL_KIND_PASSWORD_RESET: email_service.send_password_reset_email,
+}
+
+
+def _cabinet_link(path: str) -> Optional[str]:
+    """Absolute cabinet URL for an email link; the token is appended by the email service.
+
+    Built per email, so CABINET_URL / CABINET_ALLOWED_ORIGINS changed in the admin
+    settings take effect without a restart.
+    """
+    base_url = settings.get_cabinet_url()
+    if "://" not in base_url:
+        logger.warning(
+            "Cabinet email link %s not sent: set CABINET_URL to the absolute cabinet address",
+            path,
+        )
+        return None
+    return f"{base_url}{path}"
+
+
+async def _send_email(background_tasks: BackgroundTasks, kind: str, **fields) -> None:
+    """Hand the email to the Redis queue worker, or send it after the response."""
+    if await email_queue_service.enqueue(kind, **fields):
+        return
+    background_tasks.add_task(_EMAIL_SENDERS[kind], **fields)
+
+
+def _email_already_registered() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="This email is already registered",
+    )
 
 
 def _user_to_response(user: User) -> UserResponse:
-    """Convert User model to UserResponse."""
-    return UserResponse(
+    """Convert User model to UserResponse without re-validating trusted DB data."""
+    return UserResponse.model_construct(
         id=user.id,
         telegram_id=user.telegram_id,
         username=user.username,
@@ -75,7 +165,7 @@ def _create_auth_response(user: User) -> AuthResponse:
     refresh_token = create_refresh_token(user.id)
     expires_in = settings.get_cabinet_access_token_expire_minutes() * 60
 
-    return AuthResponse(
+    return AuthResponse.model_construct(
         access_token=access_token,
         refresh_token=refresh_token,
         token_type="bearer",
@@ -84,14 +174,23 @@ def _create_auth_response(user: User) -> AuthResponse:
     )
 
 
-async def _store_refresh_token(
+async def _get_login_user(db: AsyncSession, telegram_id: int) -> Optional[User]:
+    """Load a user for login with a single query.
+
+    Login only touches plain columns, so the relationship loads done by
+    get_user_by_telegram_id (four extra round trips) are skipped.
+    """
+    return await db.scalar(_SELECT_USER_BY_TELEGRAM_ID, {"telegram_id": telegram_id})
+
+
+def _add_refresh_token(
     db: AsyncSession,
     user_id: int,
     refresh_token: str,
     device_info: Optional[str] = None,
 ) -> None:
-    """Store refresh token hash in database."""
-    token_hash = hashlib.sha256(refresh_token.encode()).hexdigest()
+    """Add refresh token hash to the session; the caller commits."""
+    token_hash = refresh_token_fingerprint(refresh_token)
     expires_at = get_refresh_token_expires_at()
 
     token_record = CabinetRefreshToken(
@@ -101,10 +200,14 @@ async def _store_refresh_token(
         expires_at=expires_at,
     )
     db.add(token_record)
-    await db.commit()
 
 
-@router.post("/telegram", response_model=AuthResponse)
+@router.post(
+    "/telegram",
+    response_model=None,
+    responses={200: {"model": AuthResponse}},
+    dependencies=[Depends(rate_limit("telegram", capacity=10, period=60))],
+)
 async def auth_telegram(
     request: TelegramAuthRequest,
     db: AsyncSession = Depends(get_cabinet_db),
@@ -130,14 +233,28 @@ async def auth_telegram(
             detail="Missing Telegram user ID",
         )
 
-    user = await get_user_by_telegram_id(db, telegram_id)
-
     # Get user data from initData
     tg_username = user_data.get("username")
     tg_first_name = user_data.get("first_name")
     tg_last_name = user_data.get("last_name")
     tg_language = user_data.get("language_code", "ru")
 
+    # Existing user: refresh non-empty profile fields from initData (like bot
+    # middleware does) and stamp the login in a single UPDATE ... RETURNING
+    result = await db.execute(
+        update(User)
+        .where(User.telegram_id == telegram_id)
+        .values(
+            username=func.coalesce(tg_username or None, User.username),
+            first_name=func.coalesce(tg_first_name or None, User.first_name),
+            last_name=func.coalesce(tg_last_name or None, User.last_name),
+            cabinet_last_login=func.now(),
+        )
+        .returning(User)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    user = result.scalar_one_or_none()
+
     if not user:
         # Create new user from Telegram initData
         logger.info(f"Creating new user from cabinet (initData): telegram_id={telegram_id}")
@@ -150,40 +267,28 @@ async def auth_telegram(
             language=tg_language,
         )
         logger.info(f"User created successfully: id={user.id}, telegram_id={user.telegram_id}")
-    else:
-        # Update user info from initData (like bot middleware does)
-        updated = False
-        if tg_username and tg_username != user.username:
-            user.username = tg_username
-            updated = True
-        if tg_first_name and tg_first_name != user.first_name:
-            user.first_name = tg_first_name
-            updated = True
-        if tg_last_name and tg_last_name != user.last_name:
-            user.last_name = tg_last_name
-            updated = True
-        if updated:
-            logger.info(f"User {user.id} profile updated from initData")
+        user.cabinet_last_login = func.now()
 
+    # An inactive user's UPDATE is rolled back when the session closes
     if user.status != "active":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is not active",
         )
 
-    # Update last login
-    user.cabinet_last_login = datetime.utcnow()
-    await db.commit()
-
+    # Store refresh token in the same commit as the profile/last login update
     response = _create_auth_response(user)
-
-    # Store refresh token
-    await _store_refresh_token(db, user.id, response.refresh_token)
+    _add_refresh_token(db, user.id, response.refresh_token)
+    await db.commit()
 
     return response
 
 
-@router.post("/telegram/widget", response_model=AuthResponse)
+@router.post(
+    "/telegram/widget",
+    response_model=None,
+    responses={200: {"model": AuthResponse}},
+)
 async def auth_telegram_widget(
     request: TelegramWidgetAuthRequest,
     db: AsyncSession = Depends(get_cabinet_db),
@@ -202,7 +307,7 @@ async def auth_telegram_widget(
             detail="Invalid or expired Telegram authentication data",
         )
 
-    user = await get_user_by_telegram_id(db, request.id)
+    user = await _get_login_user(db, request.id)
 
     if not user:
         # Create new user from Telegram data
@@ -231,11 +336,10 @@ async def auth_telegram_widget(
     if request.last_name != user.last_name:
         user.last_name = request.last_name
 
-    user.cabinet_last_login = datetime.utcnow()
-    await db.commit()
-
+    user.cabinet_last_login = func.now()
     response = _create_auth_response(user)
-    await _store_refresh_token(db, user.id, response.refresh_token)
+    _add_refresh_token(db, user.id, response.refresh_token)
+    await db.commit()
 
     return response
 
@@ -243,6 +347,7 @@ async def auth_telegram_widget(
 @router.post("/email/register")
 async def register_email(
     request: EmailRegisterRequest,
+    background_tasks: BackgroundTasks,
     user: User = Depends(get_current_cabinet_user),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
@@ -252,16 +357,6 @@ async def register_email(
     Requires valid JWT token from Telegram authentication.
     Sends verification email to the provided address.
     """
-    # Check if email already exists
-    existing_user = await db.execute(
-        select(User).where(User.email == request.email)
-    )
-    if existing_user.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="This email is already registered",
-        )
-
     # Check if user already has email
     if user.email and user.email_verified:
         raise HTTPException(
@@ -269,24 +364,52 @@ async def register_email(
             detail="You already have a verified email",
         )
 
+    # Cheap check first, so a taken address does not cost an Argon2 hash
+    if await db.scalar(select(exists().where(User.email == request.email))):
+        raise _email_already_registered()
+
     # Generate verification token
     verification_token = generate_verification_token()
     verification_expires = get_verification_expires_at()
+    password_hash = await hash_password_async(request.password)
 
-    # Update user
-    user.email = request.email
-    user.email_verified = False
-    user.password_hash = hash_password(request.password)
-    user.email_verification_token = verification_token
-    user.email_verification_expires = verification_expires
-
-    await db.commit()
-
-    # Send verification email
-    if email_service.is_configured():
-        # TODO: Get actual verification URL from settings
-        verification_url = "https://example.com/cabinet/verify-email"
-        email_service.send_verification_email(
+    # Update user only if no account has this email yet. Concurrent requests for
+    # the same address both pass NOT EXISTS; the unique idx_users_email rejects the second.
+    email_owner = aliased(User)
+    try:
+        result = await db.execute(
+            update(User)
+            .where(
+                User.id == user.id,
+                ~exists().where(email_owner.email == request.email),
+            )
+            .values(
+                email=request.email,
+                email_verified=False,
+                password_hash=password_hash,
+                email_verification_token=hash_email_token(verification_token),
+                email_verification_expires=verification_expires,
+            )
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.scalar_one_or_none() is not None
+        if claimed:
+            await db.commit()
+    except IntegrityError as exc:  # duplicate email
+        await db.rollback()
+        raise _email_already_registered() from exc
+
+    if not claimed:
+        await db.rollback()
+        raise _email_already_registered()
+
+    # Delivered by the email queue worker, or after the response if it is not running
+    verification_url = _cabinet_link("/verify-email") if email_service.is_configured() else None
+    if verification_url:
+        await _send_email(
+            background_tasks,
+            EMAIL_KIND_VERIFICATION,
             to_email=request.email,
             verification_token=verification_token,
             verification_url=verification_url,
@@ -306,10 +429,10 @@ async def verify_email(
 ):
     """Verify email with token."""
     # Find user with this token
-    result = await db.execute(
-        select(User).where(User.email_verification_token == request.token)
+    user = await db.scalar(
+        _SELECT_USER_BY_VERIFICATION_TOKEN,
+        {"token_hash": hash_email_token(request.token)},
     )
-    user = result.scalar_one_or_none()
 
     if not user:
         raise HTTPException(
@@ -336,6 +459,7 @@ async def verify_email(
 
 @router.post("/email/resend")
 async def resend_verification(
+    background_tasks: BackgroundTasks,
     user: User = Depends(get_current_cabinet_user),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
@@ -356,15 +480,17 @@ async def resend_verification(
     verification_token = generate_verification_token()
     verification_expires = get_verification_expires_at()
 
-    user.email_verification_token = verification_token
+    user.email_verification_token = hash_email_token(verification_token)
     user.email_verification_expires = verification_expires
 
     await db.commit()
 
-    # Send verification email
-    if email_service.is_configured():
-        verification_url = "https://example.com/cabinet/verify-email"
-        email_service.send_verification_email(
+    # Delivered by the email queue worker, or after the response if it is not running
+    verification_url = _cabinet_link("/verify-email") if email_service.is_configured() else None
+    if verification_url:
+        await _send_email(
+            background_tasks,
+            EMAIL_KIND_VERIFICATION,
             to_email=user.email,
             verification_token=verification_token,
             verification_url=verification_url,
@@ -374,17 +500,19 @@ async def resend_verification(
     return {"message": "Verification email sent"}
 
 
-@router.post("/email/login", response_model=AuthResponse)
+@router.post(
+    "/email/login",
+    response_model=None,
+    responses={200: {"model": AuthResponse}},
+    dependencies=[Depends(rate_limit("email_login", capacity=5, period=60))],
+)
 async def login_email(
     request: EmailLoginRequest,
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Login with email and password."""
     # Find user by email
-    result = await db.execute(
-        select(User).where(User.email == request.email)
-    )
-    user = result.scalar_one_or_none()
+    user = await db.scalar(_SELECT_USER_BY_EMAIL, {"email": request.email})
 
     if not user:
         raise HTTPException(
@@ -398,7 +526,7 @@ async def login_email(
             detail="Password login not configured for this account",
         )
 
-    if not verify_password(request.password, user.password_hash):
+    if not await verify_password_async(request.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -416,16 +544,23 @@ async def login_email(
             detail="User account is not active",
         )
 
-    user.cabinet_last_login = datetime.utcnow()
-    await db.commit()
+    # Transparently upgrade legacy bcrypt and outdated Argon2 hashes
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(request.password)
 
+    user.cabinet_last_login = func.now()
     response = _create_auth_response(user)
-    await _store_refresh_token(db, user.id, response.refresh_token)
+    _add_refresh_token(db, user.id, response.refresh_token)
+    await db.commit()
 
     return response
 
 
-@router.post("/refresh", response_model=TokenResponse)
+@router.post(
+    "/refresh",
+    response_model=None,
+    responses={200: {"model": TokenResponse}},
+)
 async def refresh_token(
     request: RefreshTokenRequest,
     db: AsyncSession = Depends(get_cabinet_db),
@@ -448,39 +583,41 @@ async def refresh_token(
         )
 
     # Verify token exists in database and is not revoked
-    token_hash = hashlib.sha256(request.refresh_token.encode()).hexdigest()
+    token_hash, legacy_hash = _token_hash_candidates(request.refresh_token)
     result = await db.execute(
-        select(CabinetRefreshToken).where(
-            CabinetRefreshToken.token_hash == token_hash,
-            CabinetRefreshToken.revoked_at.is_(None),
-        )
+        _SELECT_ACTIVE_REFRESH_TOKEN_WITH_USER,
+        {"token_hashes": [token_hash, legacy_hash], "user_id": user_id},
     )
-    token_record = result.scalar_one_or_none()
+    row = result.first()
 
-    if not token_record:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token not found or revoked",
         )
 
+    token_record, telegram_id, user_status = row
+
     if not token_record.is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token is no longer valid",
         )
 
-    user = await get_user_by_id(db, user_id)
-
-    if not user or user.status != "active":
+    if user_status != "active":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
 
-    access_token = create_access_token(user.id, user.telegram_id)
+    if token_record.token_hash == legacy_hash:
+        token_record.token_hash = token_hash
+        await db.commit()
+
+    access_token = create_access_token(user_id, telegram_id)
     expires_in = settings.get_cabinet_access_token_expire_minutes() * 60
 
-    return TokenResponse(
+    return TokenResponse.model_construct(
         access_token=access_token,
         refresh_token=request.refresh_token,
         token_type="bearer",
@@ -494,14 +631,11 @@ async def logout(
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Logout and revoke refresh token."""
-    token_hash = hashlib.sha256(request.refresh_token.encode()).hexdigest()
-
     result = await db.execute(
-        select(CabinetRefreshToken).where(
-            CabinetRefreshToken.token_hash == token_hash,
-        )
+        _SELECT_REFRESH_TOKEN,
+        {"token_hashes": list(_token_hash_candidates(request.refresh_token))},
     )
-    token_record = result.scalar_one_or_none()
+    token_record = result.scalars().first()
 
     if token_record:
         token_record.revoked_at = datetime.utcnow()
@@ -510,16 +644,17 @@ async def logout(
     return {"message": "Logged out successfully"}
 
 
-@router.post("/password/forgot")
+@router.post(
+    "/password/forgot",
+    dependencies=[Depends(rate_limit("password_forgot", capacity=3, period=60))],
+)
 async def forgot_password(
     request: PasswordForgotRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Request password reset."""
-    result = await db.execute(
-        select(User).where(User.email == request.email)
-    )
-    user = result.scalar_one_or_none()
+    user = await db.scalar(_SELECT_USER_BY_EMAIL, {"email": request.email})
 
     # Always return success to prevent email enumeration
     if not user or not user.email_verified:
@@ -529,15 +664,17 @@ async def forgot_password(
     reset_token = generate_password_reset_token()
     reset_expires = get_password_reset_expires_at()
 
-    user.password_reset_token = reset_token
+    user.password_reset_token = hash_email_token(reset_token)
     user.password_reset_expires = reset_expires
 
     await db.commit()
 
-    # Send reset email
-    if email_service.is_configured():
-        reset_url = "https://example.com/cabinet/reset-password"
-        email_service.send_password_reset_email(
+    # Delivered by the email queue worker, or after the response if it is not running
+    reset_url = _cabinet_link("/reset-password") if email_service.is_configured() else None
+    if reset_url:
+        await _send_email(
+            background_tasks,
+            EMAIL_KIND_PASSWORD_RESET,
             to_email=user.email,
             reset_token=reset_token,
             reset_url=reset_url,
@@ -553,10 +690,10 @@ async def reset_password(
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Reset password with token."""
-    result = await db.execute(
-        select(User).where(User.password_reset_token == request.token)
+    user = await db.scalar(
+        _SELECT_USER_BY_RESET_TOKEN,
+        {"token_hash": hash_email_token(request.token)},
     )
-    user = result.scalar_one_or_none()
 
     if not user:
         raise HTTPException(
@@ -571,7 +708,7 @@ async def reset_password(
         )
 
     # Update password
-    user.password_hash = hash_password(request.password)
+    user.password_hash = await hash_password_async(request.password)
     user.password_reset_token = None
     user.password_reset_expires = None
 
@@ -580,7 +717,11 @@ async def reset_password(
     return {"message": "Password reset successfully"}
 
 
-@router.get("/me", response_model=UserResponse)
+@router.get(
+    "/me",
+    response_model=None,
+    responses={200: {"model": UserResponse}},
+)
 async def get_current_user(
     user: User = Depends(get_current_cabinet_user),
 ):
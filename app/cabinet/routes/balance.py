@@ -1,18 +1,27 @@
 """Balance and payment routes for cabinet."""
 
+import asyncio
+import base64
+import binascii
 import logging
 import math
-from typing import List, Optional
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import orjson
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, desc, tuple_
 
+from app.database.database import AsyncSessionLocal
 from app.database.models import User, Transaction
 from app.config import settings
 from app.services.yookassa_service import YooKassaService
 from app.external.cryptobot import CryptoBotService
-from app.database.crud.user import get_user_by_id
 from app.services.payment_service import PaymentService
 
 from ..dependencies import get_cabinet_db, get_current_cabinet_user
@@ -27,74 +36,131 @@ from ..schemas.balance import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/balance", tags=["Cabinet Balance"])
+router = APIRouter(
+    prefix="/balance",
+    tags=["Cabinet Balance"],
+    default_response_class=ORJSONResponse,
+)
+
+_TRANSACTION_LIST_ADAPTER = TypeAdapter(List[TransactionResponse])
+
+
+def _encode_cursor(transaction: TransactionResponse) -> str:
+    """Encode the (created_at, id) position of a transaction as an opaque cursor."""
+    raw = orjson.dumps([transaction.created_at.isoformat(), transaction.id])
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        created_at, transaction_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(transaction_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
 
 @router.get("", response_model=BalanceResponse)
 async def get_balance(
     user: User = Depends(get_current_cabinet_user),
-    db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get current user's balance."""
-    # Reload user from current session to get fresh data
-    # (user object is from different session in get_current_cabinet_user)
-    fresh_user = await get_user_by_id(db, user.id)
-    if not fresh_user:
-        raise HTTPException(status_code=404, detail="User not found")
-
+    # The user was loaded by get_current_cabinet_user within this request, so
+    # the balance is already current; no second lookup is needed.
     return BalanceResponse(
-        balance_kopeks=fresh_user.balance_kopeks,
-        balance_rubles=fresh_user.balance_kopeks / 100,
+        balance_kopeks=user.balance_kopeks,
+        balance_rubles=user.balance_kopeks / 100,
     )
 
 
+async def _count_transactions(user_id: int, transaction_type: Optional[str]) -> int:
+    """Count a user's transactions in a separate session so it can overlap the page query."""
+    count_query = select(func.count()).select_from(Transaction).where(Transaction.user_id == user_id)
+    if transaction_type:
+        count_query = count_query.where(Transaction.type == transaction_type)
+
+    async with AsyncSessionLocal() as session:
+        total_result = await session.execute(count_query)
+        return total_result.scalar() or 0
+
+
 @router.get("/transactions", response_model=TransactionListResponse)
 async def get_transactions(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     type: Optional[str] = Query(None, description="Filter by transaction type"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous response's next_cursor; takes precedence over page",
+    ),
+    include_total: bool = Query(False, description="Also return total and pages (runs a COUNT)"),
     user: User = Depends(get_current_cabinet_user),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
-    """Get transaction history."""
-    # Base query
-    query = select(Transaction).where(Transaction.user_id == user.id)
+    """Get transaction history.
+
+    Prefer ``cursor`` pagination: deep pages are served by an index seek
+    instead of scanning and discarding ``(page - 1) * per_page`` rows.
+    """
+    # Base query - only the listed columns. idx_transactions_user_created_cover serves the
+    # ordering and every column except description, which stays in the heap on purpose.
+    query = select(
+        Transaction.id,
+        Transaction.type,
+        Transaction.amount_kopeks,
+        (Transaction.amount_kopeks / 100.0).label("amount_rubles"),
+        Transaction.description,
+        Transaction.payment_method,
+        Transaction.is_completed,
+        Transaction.created_at,
+        Transaction.completed_at,
+    ).where(Transaction.user_id == user.id)
 
     # Filter by type
     if type:
         query = query.where(Transaction.type == type)
 
-    # Get total count
-    count_query = select(func.count()).select_from(Transaction).where(Transaction.user_id == user.id)
-    if type:
-        count_query = count_query.where(Transaction.type == type)
-
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Paginate
-    offset = (page - 1) * per_page
-    query = query.order_by(desc(Transaction.created_at)).offset(offset).limit(per_page)
-
-    result = await db.execute(query)
-    transactions = result.scalars().all()
-
-    items = [
-        TransactionResponse(
-            id=t.id,
-            type=t.type,
-            amount_kopeks=t.amount_kopeks,
-            amount_rubles=t.amount_kopeks / 100,
-            description=t.description,
-            payment_method=t.payment_method,
-            is_completed=t.is_completed,
-            created_at=t.created_at,
-            completed_at=t.completed_at,
+    # Paginate - newest first, id breaks ties between equal timestamps
+    query = query.order_by(desc(Transaction.created_at), desc(Transaction.id)).limit(per_page + 1)
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        query = query.where(
+            tuple_(Transaction.created_at, Transaction.id) < tuple_(cursor_created_at, cursor_id)
         )
-        for t in transactions
-    ]
+    else:
+        query = query.offset((page - 1) * per_page)
+
+    # Total count only on request; has_more comes from one extra row instead.
+    # The count runs on its own connection, concurrently with the page query.
+    # It starts only after the cursor is validated, so a 400 never leaves it running.
+    count_task = None
+    if include_total:
+        count_task = asyncio.create_task(_count_transactions(user.id, type))
+
+    try:
+        result = await db.execute(query)
+    except BaseException:
+        if count_task is not None:
+            count_task.cancel()
+        raise
+    rows = result.mappings().all()
+
+    total = None
+    pages = None
+    if count_task is not None:
+        total = await count_task
+        pages = math.ceil(total / per_page) if total > 0 else 1
+    has_more = len(rows) > per_page
 
-    pages = math.ceil(total / per_page) if total > 0 else 1
+    # Column names match the response fields, so the page is validated in one call
+    items = _TRANSACTION_LIST_ADAPTER.validate_python(rows[:per_page])
+
+    next_cursor = None
+    if has_more:
+        next_cursor = _encode_cursor(items[-1])
 
     return TransactionListResponse(
         items=items,
@@ -102,17 +168,22 @@ async def get_transactions(
         page=page,
         per_page=per_page,
         pages=pages,
+        has_more=has_more,
+        next_cursor=next_cursor,
     )
 
 
-@router.get("/payment-methods", response_model=List[PaymentMethodResponse])
-async def get_payment_methods():
-    """Get available payment methods."""
-    methods = []
+@lru_cache(maxsize=1)
+def _payment_methods_by_id() -> Dict[str, PaymentMethodResponse]:
+    """Enabled payment methods keyed by id; rebuilt only after payment settings change."""
+    methods: Dict[str, PaymentMethodResponse] = {}
+
+    def _add(method: PaymentMethodResponse) -> None:
+        methods[method.id] = method
 
     # YooKassa
     if settings.is_yookassa_enabled():
-        methods.append(PaymentMethodResponse(
+        _add(PaymentMethodResponse(
             id="yookassa",
             name="YooKassa (Bank Card)",
             description="Pay with bank card via YooKassa",
@@ -123,7 +194,7 @@ async def get_payment_methods():
 
     # CryptoBot
     if settings.is_cryptobot_enabled():
-        methods.append(PaymentMethodResponse(
+        _add(PaymentMethodResponse(
             id="cryptobot",
             name="CryptoBot",
             description="Pay with cryptocurrency via CryptoBot",
@@ -134,7 +205,7 @@ async def get_payment_methods():
 
     # Telegram Stars
     if settings.TELEGRAM_STARS_ENABLED:
-        methods.append(PaymentMethodResponse(
+        _add(PaymentMethodResponse(
             id="telegram_stars",
             name="Telegram Stars",
             description="Pay with Telegram Stars",
@@ -145,7 +216,7 @@ async def get_payment_methods():
 
     # Heleket
     if settings.is_heleket_enabled():
-        methods.append(PaymentMethodResponse(
+        _add(PaymentMethodResponse(
             id="heleket",
             name="Heleket Crypto",
             description="Pay with cryptocurrency via Heleket",
@@ -156,7 +227,7 @@ async def get_payment_methods():
 
     # MulenPay
     if settings.is_mulenpay_enabled():
-        methods.append(PaymentMethodResponse(
+        _add(PaymentMethodResponse(
             id="mulenpay",
             name=settings.get_mulenpay_display_name(),
             description="MulenPay payment",
@@ -167,7 +238,7 @@ async def get_payment_methods():
 
     # PAL24
     if settings.is_pal24_enabled():
-        methods.append(PaymentMethodResponse(
+        _add(PaymentMethodResponse(
             id="pal24",
             name="PAL24",
             description="Pay via PAL24",
@@ -178,7 +249,7 @@ async def get_payment_methods():
 
     # Platega
     if settings.is_platega_enabled():
-        methods.append(PaymentMethodResponse(
+        _add(PaymentMethodResponse(
             id="platega",
             name="Platega",
             description="Pay via Platega",
@@ -189,7 +260,7 @@ async def get_payment_methods():
 
     # Wata
     if settings.is_wata_enabled():
-        methods.append(PaymentMethodResponse(
+        _add(PaymentMethodResponse(
             id="wata",
             name="Wata",
             description="Pay via Wata",
@@ -201,43 +272,92 @@ async def get_payment_methods():
     return methods
 
 
+@lru_cache(maxsize=1)
+def _payment_methods() -> Tuple[PaymentMethodResponse, ...]:
+    """Immutable snapshot of the enabled payment methods in display order."""
+    return tuple(_payment_methods_by_id().values())
+
+
+@lru_cache(maxsize=1)
+def _payment_limits() -> Dict[str, Tuple[int, int]]:
+    """(min, max) top-up amounts in kopeks for each available payment method."""
+    return {
+        method_id: (method.min_amount_kopeks, method.max_amount_kopeks)
+        for method_id, method in _payment_methods_by_id().items()
+        if method.is_available
+    }
+
+
+def get_payment_limits(method_id: str) -> Optional[Tuple[int, int]]:
+    """Top-up limits of an available payment method, or None if it cannot be used."""
+    return _payment_limits().get(method_id)
+
+
+def reset_payment_methods_cache() -> None:
+    """Drop the cached payment methods after a payment setting is changed."""
+    _payment_methods_by_id.cache_clear()
+    _payment_methods.cache_clear()
+    _payment_limits.cache_clear()
+
+
+@router.get("/payment-methods", response_model=List[PaymentMethodResponse])
+async def get_payment_methods():
+    """Get available payment methods."""
+    return _payment_methods()
+
+
+@lru_cache(maxsize=1)
+def _standalone_payment_service() -> PaymentService:
+    """Process-wide PaymentService for apps started without the unified server state."""
+    return PaymentService()
+
+
+def _get_payment_service(http_request: Request) -> PaymentService:
+    """Shared PaymentService built at startup, so provider clients are not rebuilt per request."""
+    payment_service = getattr(http_request.app.state, "payment_service", None)
+    return payment_service or _standalone_payment_service()
+
+
 @router.post("/topup", response_model=TopUpResponse)
 async def create_topup(
     request: TopUpRequest,
+    http_request: Request,
     user: User = Depends(get_current_cabinet_user),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Create payment for balance top-up."""
     # Validate payment method
-    methods = await get_payment_methods()
-    method = next((m for m in methods if m.id == request.payment_method), None)
+    limits = get_payment_limits(request.payment_method)
 
-    if not method or not method.is_available:
+    if limits is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or unavailable payment method",
         )
 
     # Validate amount
-    if request.amount_kopeks < method.min_amount_kopeks:
+    min_amount_kopeks, max_amount_kopeks = limits
+    if request.amount_kopeks < min_amount_kopeks:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Minimum amount is {method.min_amount_kopeks / 100:.2f} RUB",
+            detail=f"Minimum amount is {min_amount_kopeks / 100:.2f} RUB",
         )
 
-    if request.amount_kopeks > method.max_amount_kopeks:
+    if request.amount_kopeks > max_amount_kopeks:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Maximum amount is {method.max_amount_kopeks / 100:.2f} RUB",
+            detail=f"Maximum amount is {max_amount_kopeks / 100:.2f} RUB",
         )
 
     amount_rubles = request.amount_kopeks / 100
     payment_url = None
     payment_id = None
+    payment_service = _get_payment_service(http_request)
 
     try:
         if request.payment_method == "yookassa":
-            yookassa_service = YooKassaService()
+            # Providers enabled after startup are not on the shared service yet
+            yookassa_service = payment_service.yookassa_service or YooKassaService()
             result = await yookassa_service.create_payment(
                 amount=amount_rubles,
                 currency="RUB",
@@ -259,7 +379,7 @@ async def create_topup(
                 )
 
         elif request.payment_method == "cryptobot":
-            cryptobot_service = CryptoBotService()
+            cryptobot_service = payment_service.cryptobot_service or CryptoBotService()
             # Convert RUB to USDT (approximate)
             usdt_amount = amount_rubles / 100  # Approximate rate
             result = await cryptobot_service.create_invoice(
@@ -315,7 +435,6 @@ async def create_topup(
                     detail="Selected Platega method is unavailable",
                 )
 
-            payment_service = PaymentService()
             result = await payment_service.create_platega_payment(
                 db=db,
                 user_id=user.id,
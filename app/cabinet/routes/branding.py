@@ -3,17 +3,24 @@
 import logging
 import os
 import base64
+import secrets
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+import aiofiles
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File
 from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
+from app.database.database import IS_SQLITE
 from app.database.models import User, SystemSetting
 from app.config import settings
+from app.utils.ttl_cache import TTLCache
 
 from ..dependencies import get_cabinet_db, get_current_admin_user
 
@@ -24,14 +31,35 @@ router = APIRouter(prefix="/branding", tags=["Branding"])
 # Directory for storing branding assets
 BRANDING_DIR = Path("data/branding")
 LOGO_FILENAME = "logo.png"
+# Every extension an upload can be saved with (see ext_map in upload_logo)
+LOGO_EXTENSIONS = (".png", ".jpg", ".webp", ".svg")
+LOGO_MEDIA_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".svg": "image/svg+xml",
+}
 
 # Settings keys
 BRANDING_NAME_KEY = "CABINET_BRANDING_NAME"
 BRANDING_LOGO_KEY = "CABINET_BRANDING_LOGO"  # Stores "custom" or "default"
+BRANDING_LOGO_FILE_KEY = "CABINET_BRANDING_LOGO_FILE"  # File name of the custom logo
+
+# BRANDING_DIR is mounted here as static files, so logos bypass the route handlers
+BRANDING_STATIC_URL = "/cabinet/branding/static"
+LEGACY_LOGO_URL = "/cabinet/branding/logo"
 
 # Allowed image types
 ALLOWED_CONTENT_TYPES = {"image/png", "image/jpeg", "image/jpg", "image/webp", "image/svg+xml"}
 MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Public branding is read on every page load and changes only through the admin
+# routes below, which replace the cached copy with the response they build.
+BRANDING_CACHE_TTL_SECONDS = 60
+_BRANDING_CACHE_KEY = "branding"
+_branding_cache: TTLCache[str, "BrandingResponse"] = TTLCache(maxsize=1, ttl=BRANDING_CACHE_TTL_SECONDS)
 
 
 # ============ Schemas ============
@@ -46,7 +74,8 @@ class BrandingResponse(BaseModel):
 
 class BrandingNameUpdate(BaseModel):
     """Request to update branding name."""
-    name: str
+    # Loose bound checked during validation; the 50-character limit applies after stripping
+    name: str = Field(..., max_length=500)
 
 
 # ============ Helper Functions ============
@@ -56,31 +85,47 @@ def ensure_branding_dir():
     BRANDING_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# Settings lookups built once; lambda statements reuse the cached compiled SQL
+_SELECT_SETTING_VALUE = lambda_stmt(
+    lambda: select(SystemSetting.value).where(SystemSetting.key == bindparam("key"))
+)
+_SELECT_SETTINGS_VALUES = lambda_stmt(
+    lambda: select(SystemSetting.key, SystemSetting.value).where(
+        SystemSetting.key.in_(bindparam("keys", expanding=True))
+    )
+)
+
+
 async def get_setting_value(db: AsyncSession, key: str) -> Optional[str]:
     """Get a setting value from database."""
-    result = await db.execute(
-        select(SystemSetting).where(SystemSetting.key == key)
-    )
-    setting = result.scalar_one_or_none()
-    return setting.value if setting else None
+    result = await db.execute(_SELECT_SETTING_VALUE, {"key": key})
+    return result.scalar_one_or_none()
 
 
-async def set_setting_value(db: AsyncSession, key: str, value: str):
-    """Set a setting value in database."""
-    result = await db.execute(
-        select(SystemSetting).where(SystemSetting.key == key)
-    )
-    setting = result.scalar_one_or_none()
+async def get_settings_values(db: AsyncSession, keys: List[str]) -> Dict[str, Optional[str]]:
+    """Get several setting values from database in one query."""
+    result = await db.execute(_SELECT_SETTINGS_VALUES, {"keys": keys})
+    return dict(result.all())
 
-    if setting:
-        setting.value = value
-    else:
-        setting = SystemSetting(key=key, value=value)
-        db.add(setting)
 
+async def set_settings_values(db: AsyncSession, values: Dict[str, str]):
+    """Set several setting values in database with a single upsert."""
+    insert_stmt = (sqlite_insert if IS_SQLITE else pg_insert)(SystemSetting).values(
+        [{"key": key, "value": value} for key, value in values.items()]
+    )
+    stmt = insert_stmt.on_conflict_do_update(
+        index_elements=[SystemSetting.key],
+        set_={"value": insert_stmt.excluded.value, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
     await db.commit()
 
 
+async def set_setting_value(db: AsyncSession, key: str, value: str):
+    """Set a setting value in database with a single upsert."""
+    await set_settings_values(db, {key: value})
+
+
 def get_logo_path() -> Path:
     """Get the path to the custom logo file."""
     return BRANDING_DIR / LOGO_FILENAME
@@ -91,65 +136,130 @@ def has_custom_logo() -> bool:
     return get_logo_path().exists()
 
 
+def remove_logo_files(keep: Optional[Path] = None) -> None:
+    """Delete stored logo files by their known names, optionally keeping one."""
+    for extension in LOGO_EXTENSIONS:
+        logo_file = BRANDING_DIR / f"logo{extension}"
+        if logo_file != keep:
+            logo_file.unlink(missing_ok=True)
+
+
+def resolve_branding_name(values: Dict[str, Optional[str]]) -> str:
+    """Stored branding name, or the env/settings default when it was never set."""
+    name = values.get(BRANDING_NAME_KEY)
+    if name is None:  # Only use fallback if not set at all (empty string is valid)
+        name = getattr(settings, 'CABINET_BRANDING_NAME', None) or \
+               os.getenv('VITE_APP_NAME', 'Cabinet')
+    return name
+
+
+def resolve_logo_url(values: Dict[str, Optional[str]], custom_logo: bool) -> Optional[str]:
+    """Static URL of the custom logo; logos uploaded before the file name was stored use the route."""
+    if not custom_logo:
+        return None
+    logo_file = values.get(BRANDING_LOGO_FILE_KEY)
+    if logo_file:
+        return f"{BRANDING_STATIC_URL}/{logo_file}"
+    return LEGACY_LOGO_URL
+
+
+def resolve_custom_logo(values: Dict[str, Optional[str]]) -> bool:
+    """Whether a custom logo is set; checks the filesystem only if the flag was never stored."""
+    logo_flag = values.get(BRANDING_LOGO_KEY)
+    if logo_flag is None:
+        return has_custom_logo()
+    return logo_flag == "custom"
+
+
+def build_branding(name: str, logo_url: Optional[str], custom_logo: bool) -> BrandingResponse:
+    """Build the branding response and store it as the cached public branding."""
+    branding = BrandingResponse(
+        name=name,
+        logo_url=logo_url,
+        # First letter for logo fallback (use "V" if name is empty)
+        logo_letter=name[0].upper() if name else "V",
+        has_custom_logo=custom_logo,
+    )
+    _branding_cache.set(_BRANDING_CACHE_KEY, branding)
+    return branding
+
+
 # ============ Routes ============
 
 @router.get("", response_model=BrandingResponse)
 async def get_branding(
+    response: Response,
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """
     Get current branding settings.
     This is a public endpoint - no authentication required.
     """
-    # Get name from database or use default from env/settings
-    name = await get_setting_value(db, BRANDING_NAME_KEY)
-    if name is None:  # Only use fallback if not set at all (empty string is valid)
-        name = getattr(settings, 'CABINET_BRANDING_NAME', None) or \
-               os.getenv('VITE_APP_NAME', 'Cabinet')
+    response.headers["Cache-Control"] = f"public, max-age={BRANDING_CACHE_TTL_SECONDS}"
 
-    # Check for custom logo
-    custom_logo = has_custom_logo()
+    cached = _branding_cache.get(_BRANDING_CACHE_KEY)
+    if cached is not None:
+        return cached
 
-    # Get first letter for logo fallback (use "V" if name is empty)
-    logo_letter = name[0].upper() if name else "V"
+    # Name and logo flag from database in one query, with defaults from env/settings
+    values = await get_settings_values(db, [BRANDING_NAME_KEY, BRANDING_LOGO_KEY, BRANDING_LOGO_FILE_KEY])
+    name = resolve_branding_name(values)
+    custom_logo = resolve_custom_logo(values)
 
-    return BrandingResponse(
-        name=name,
-        logo_url="/cabinet/branding/logo" if custom_logo else None,
-        logo_letter=logo_letter,
-        has_custom_logo=custom_logo,
-    )
+    return build_branding(name, resolve_logo_url(values, custom_logo), custom_logo)
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current logo file."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in tags or "*" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since
+
+    return False
 
 
 @router.get("/logo")
-async def get_logo():
+async def get_logo(request: Request):
     """
     Get the custom logo image.
-    Returns 404 if no custom logo is set.
+    Returns 404 if no custom logo is set, 304 if the client copy is current.
     """
     logo_path = get_logo_path()
 
-    if not logo_path.exists():
+    try:
+        stat_result = logo_path.stat()
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No custom logo set"
         )
 
-    # Determine media type from file extension
-    suffix = logo_path.suffix.lower()
-    media_types = {
-        ".png": "image/png",
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".webp": "image/webp",
-        ".svg": "image/svg+xml",
+    headers = {
+        "Cache-Control": "public, max-age=3600",
+        "ETag": f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
     }
-    media_type = media_types.get(suffix, "image/png")
+
+    if _not_modified(request, headers["ETag"], stat_result.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Determine media type from file extension
+    media_type = LOGO_MEDIA_TYPES.get(logo_path.suffix.lower(), "image/png")
 
     return FileResponse(
         logo_path,
         media_type=media_type,
-        headers={"Cache-Control": "public, max-age=3600"}
+        headers=headers,
+        stat_result=stat_result,
     )
 
 
@@ -168,20 +278,14 @@ async def update_branding_name(
             detail="Name too long (max 50 characters)"
         )
 
+    values = await get_settings_values(db, [BRANDING_LOGO_KEY, BRANDING_LOGO_FILE_KEY])
     await set_setting_value(db, BRANDING_NAME_KEY, name)
 
     logger.info(f"Admin {admin.telegram_id} updated branding name to: {name}")
 
     # Return updated branding
-    custom_logo = has_custom_logo()
-    logo_letter = name[0].upper() if name else "C"
-
-    return BrandingResponse(
-        name=name,
-        logo_url="/cabinet/branding/logo" if custom_logo else None,
-        logo_letter=logo_letter,
-        has_custom_logo=custom_logo,
-    )
+    custom_logo = resolve_custom_logo(values)
+    return build_branding(name, resolve_logo_url(values, custom_logo), custom_logo)
 
 
 @router.post("/logo", response_model=BrandingResponse)
@@ -198,15 +302,14 @@ async def upload_logo(
             detail=f"Invalid file type. Allowed: PNG, JPEG, WebP, SVG"
         )
 
-    # Read file content
-    content = await file.read()
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large. Maximum size: {MAX_FILE_SIZE // 1024 // 1024}MB"
+    )
 
-    # Validate file size
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Maximum size: {MAX_FILE_SIZE // 1024 // 1024}MB"
-        )
+    # Reject by declared size before reading anything
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise too_large
 
     # Ensure directory exists
     ensure_branding_dir()
@@ -221,33 +324,35 @@ async def upload_logo(
     }
     extension = ext_map.get(file.content_type, ".png")
 
-    # Remove old logo files with any extension
-    for old_file in BRANDING_DIR.glob("logo.*"):
-        old_file.unlink()
-
-    # Save new logo
+    # Stream into a temporary file, stopping as soon as the limit is exceeded
     logo_path = BRANDING_DIR / f"logo{extension}"
-    logo_path.write_bytes(content)
-
-    # Mark that we have a custom logo
-    await set_setting_value(db, BRANDING_LOGO_KEY, "custom")
+    upload_path = BRANDING_DIR / f".upload-{secrets.token_hex(8)}{extension}"
+    written = 0
+    try:
+        async with aiofiles.open(upload_path, "wb") as upload_file:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if written > MAX_FILE_SIZE:
+                    raise too_large
+                await upload_file.write(chunk)
+
+        # Swap the new logo in atomically
+        os.replace(upload_path, logo_path)
+    finally:
+        upload_path.unlink(missing_ok=True)
+
+    # Remove old logo files with other extensions
+    remove_logo_files(keep=logo_path)
+
+    # Mark that we have a custom logo and remember its file for the static URL
+    values = await get_settings_values(db, [BRANDING_NAME_KEY])
+    await set_settings_values(db, {BRANDING_LOGO_KEY: "custom", BRANDING_LOGO_FILE_KEY: logo_path.name})
 
     logger.info(f"Admin {admin.telegram_id} uploaded new logo: {logo_path}")
 
-    # Get current name for response
-    name = await get_setting_value(db, BRANDING_NAME_KEY)
-    if name is None:  # Only use fallback if not set at all (empty string is valid)
-        name = getattr(settings, 'CABINET_BRANDING_NAME', None) or \
-               os.getenv('VITE_APP_NAME', 'Cabinet')
-
-    logo_letter = name[0].upper() if name else "C"
-
-    return BrandingResponse(
-        name=name,
-        logo_url="/cabinet/branding/logo",
-        logo_letter=logo_letter,
-        has_custom_logo=True,
-    )
+    # Current name for response
+    name = resolve_branding_name(values)
+    return build_branding(name, f"{BRANDING_STATIC_URL}/{logo_path.name}", True)
 
 
 @router.delete("/logo", response_model=BrandingResponse)
@@ -257,25 +362,14 @@ async def delete_logo(
 ):
     """Delete custom logo and revert to letter. Admin only."""
     # Remove logo files
-    for old_file in BRANDING_DIR.glob("logo.*"):
-        old_file.unlink()
+    remove_logo_files()
 
     # Update setting
+    values = await get_settings_values(db, [BRANDING_NAME_KEY])
     await set_setting_value(db, BRANDING_LOGO_KEY, "default")
 
     logger.info(f"Admin {admin.telegram_id} deleted custom logo")
 
-    # Get current name for response
-    name = await get_setting_value(db, BRANDING_NAME_KEY)
-    if name is None:  # Only use fallback if not set at all (empty string is valid)
-        name = getattr(settings, 'CABINET_BRANDING_NAME', None) or \
-               os.getenv('VITE_APP_NAME', 'Cabinet')
-
-    logo_letter = name[0].upper() if name else "C"
-
-    return BrandingResponse(
-        name=name,
-        logo_url=None,
-        logo_letter=logo_letter,
-        has_custom_logo=False,
-    )
+    # Current name for response
+    name = resolve_branding_name(values)
+    return build_branding(name, None, False)
@@ -1,22 +1,28 @@
 """Contests routes for cabinet - user participation in games/contests."""
 
+import asyncio
 import logging
-import random
+import secrets
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models import User, SubscriptionStatus
+from app.database.database import AsyncSessionLocal
+from app.database.models import Subscription, User, SubscriptionStatus
 from app.database.crud.contest import (
-    get_active_rounds,
+    ActiveRoundInfo,
+    get_active_round_by_id,
+    get_active_round_infos,
     get_attempt,
+    get_attempts_for_rounds,
+    get_prize_days,
     create_attempt,
     increment_winner_count,
 )
-from app.database.crud.subscription import get_subscription_by_user_id, extend_subscription
+from app.database.crud.subscription import extend_subscription
 from app.services.contest_rotation_service import (
     GAME_QUEST,
     GAME_LOCKS,
@@ -27,12 +33,15 @@ from app.services.contest_rotation_service import (
     GAME_ANAGRAM,
 )
 
-from ..dependencies import get_cabinet_db, get_current_cabinet_user
+from ..dependencies import get_cabinet_db, get_current_cabinet_user, get_current_subscription
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/contests", tags=["Cabinet Contests"])
 
+# Secrets and shuffles sent to players come from the OS CSPRNG, not the shared Mersenne Twister
+_system_random = secrets.SystemRandom()
+
 
 # ============ Schemas ============
 
@@ -80,9 +89,24 @@ def _user_allowed(subscription) -> bool:
     }
 
 
-async def _award_prize(db: AsyncSession, user_id: int, prize_days: int) -> str:
+def _rounds_by_template(active_rounds: List[ActiveRoundInfo]) -> Dict[str, ActiveRoundInfo]:
+    """Earliest enabled round of each template, keyed by slug in start order."""
+    unique: Dict[str, ActiveRoundInfo] = {}
+    for rnd in active_rounds:
+        if rnd.is_enabled:
+            # setdefault keeps the first round; a dict comprehension would keep the last
+            unique.setdefault(rnd.slug, rnd)
+    return unique
+
+
+async def _has_played(round_id: int, user_id: int) -> bool:
+    """Check for an existing attempt on its own connection, so it can overlap other queries."""
+    async with AsyncSessionLocal() as session:
+        return await get_attempt(session, round_id, user_id) is not None
+
+
+async def _award_prize(db: AsyncSession, subscription: Optional[Subscription], prize_days: int) -> str:
     """Award prize to winner."""
-    subscription = await get_subscription_by_user_id(db, user_id)
     if not subscription:
         return "Error: subscription not found"
 
@@ -91,10 +115,79 @@ async def _award_prize(db: AsyncSession, user_id: int, prize_days: int) -> str:
     await db.commit()
     await db.refresh(subscription)
 
-    logger.info(f"🎁 Extended subscription for user {user_id} by {prize_days} days (contest prize)")
+    logger.info(f"🎁 Extended subscription for user {subscription.user_id} by {prize_days} days (contest prize)")
     return f"Subscription extended by {prize_days} days"
 
 
+def _build_quest(payload: Dict[str, Any]) -> Dict[str, Any]:
+    rows = payload.get("rows", 3)
+    cols = payload.get("cols", 3)
+    return {
+        "rows": rows,
+        "cols": cols,
+        "secret": secrets.randbelow(rows * cols),
+        "grid_size": rows * cols,
+    }
+
+
+def _build_locks(payload: Dict[str, Any]) -> Dict[str, Any]:
+    total = payload.get("total", 20)
+    return {
+        "total": total,
+        "secret": secrets.randbelow(total),
+    }
+
+
+def _build_server(payload: Dict[str, Any]) -> Dict[str, Any]:
+    flags = payload.get("flags") or []
+    shuffled_flags = flags.copy()
+    _system_random.shuffle(shuffled_flags)
+    return {
+        "flags": shuffled_flags,
+    }
+
+
+def _build_cipher(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "question": payload.get("question", ""),
+        "input_type": "text",
+    }
+
+
+def _build_emoji(payload: Dict[str, Any]) -> Dict[str, Any]:
+    emoji_list = payload.get("question", "🤔").split()
+    _system_random.shuffle(emoji_list)
+    return {
+        "question": " ".join(emoji_list),
+        "input_type": "text",
+    }
+
+
+def _build_anagram(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "letters": payload.get("letters", ""),
+        "input_type": "text",
+    }
+
+
+def _build_blitz(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "button_text": "I'm here!",
+    }
+
+
+# Game type -> (game data builder, instructions)
+_GAME_BUILDERS: Dict[str, Tuple[Callable[[Dict[str, Any]], Dict[str, Any]], str]] = {
+    GAME_QUEST: (_build_quest, "Select one of the nodes in the grid. Find the hidden server!"),
+    GAME_LOCKS: (_build_locks, "Find the unlocked button among the locks!"),
+    GAME_SERVER: (_build_server, "Choose a server by clicking on a flag!"),
+    GAME_CIPHER: (_build_cipher, "Decrypt the cipher and enter the answer!"),
+    GAME_EMOJI: (_build_emoji, "Guess the service by emojis!"),
+    GAME_ANAGRAM: (_build_anagram, "Make a word from the given letters!"),
+    GAME_BLITZ: (_build_blitz, "Click the button as fast as you can!"),
+}
+
+
 # ============ Routes ============
 
 class ContestsCountResponse(BaseModel):
@@ -105,31 +198,20 @@ class ContestsCountResponse(BaseModel):
 @router.get("/count", response_model=ContestsCountResponse)
 async def get_contests_count(
     user: User = Depends(get_current_cabinet_user),
+    subscription: Optional[Subscription] = Depends(get_current_subscription),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get count of contests available for the user."""
-    subscription = await get_subscription_by_user_id(db, user.id)
-
     if not _user_allowed(subscription):
         return ContestsCountResponse(count=0)
 
-    active_rounds = await get_active_rounds(db)
+    # Unique contests, one round per template
+    unique_templates = _rounds_by_template(await get_active_round_infos(db))
+    round_ids = [rnd.id for rnd in unique_templates.values()]
 
-    # Count unique available contests (not yet played)
-    count = 0
-    seen_templates = set()
-    for rnd in active_rounds:
-        if not rnd.template or not rnd.template.is_enabled:
-            continue
-        tpl_slug = rnd.template.slug if rnd.template else ""
-        if tpl_slug in seen_templates:
-            continue
-        seen_templates.add(tpl_slug)
-
-        # Check if user already played this round
-        attempt = await get_attempt(db, rnd.id, user.id)
-        if not attempt:
-            count += 1
+    # Count the ones the user has not played yet, checked in one query
+    played_ids = await get_attempts_for_rounds(db, round_ids, user.id)
+    count = sum(1 for round_id in round_ids if round_id not in played_ids)
 
     return ContestsCountResponse(count=count)
 
@@ -137,41 +219,34 @@ async def get_contests_count(
 @router.get("", response_model=List[ContestInfo])
 async def get_contests(
     user: User = Depends(get_current_cabinet_user),
+    subscription: Optional[Subscription] = Depends(get_current_subscription),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get list of available contests/games."""
-    subscription = await get_subscription_by_user_id(db, user.id)
-
     if not _user_allowed(subscription):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Contests are only available for users with active or trial subscriptions",
         )
 
-    active_rounds = await get_active_rounds(db)
-
     # Group by template to avoid duplicates
-    unique_templates = {}
-    for rnd in active_rounds:
-        if not rnd.template or not rnd.template.is_enabled:
-            continue
-        tpl_slug = rnd.template.slug if rnd.template else ""
-        if tpl_slug not in unique_templates:
-            unique_templates[tpl_slug] = rnd
+    unique_templates = _rounds_by_template(await get_active_round_infos(db))
+
+    # Rounds the user already played, checked in one query
+    played_ids = await get_attempts_for_rounds(
+        db, [rnd.id for rnd in unique_templates.values()], user.id
+    )
 
     contests = []
     for tpl_slug, rnd in unique_templates.items():
-        # Check if user already played this round
-        attempt = await get_attempt(db, rnd.id, user.id)
-
         contests.append(ContestInfo(
             id=rnd.id,
             slug=tpl_slug,
-            name=rnd.template.name if rnd.template else tpl_slug,
-            description=rnd.template.description if rnd.template else None,
-            prize_days=rnd.template.prize_days if rnd.template else 0,
+            name=rnd.name,
+            description=rnd.description,
+            prize_days=rnd.prize_days,
             is_available=True,
-            already_played=attempt is not None,
+            already_played=rnd.id in played_ids,
         ))
 
     return contests
@@ -181,18 +256,20 @@ async def get_contests(
 async def get_contest_game(
     round_id: int,
     user: User = Depends(get_current_cabinet_user),
+    subscription: Optional[Subscription] = Depends(get_current_subscription),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get game data for a specific contest round."""
-    subscription = await get_subscription_by_user_id(db, user.id)
-
     if not _user_allowed(subscription):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Contests are only available for users with active or trial subscriptions",
         )
 
-    active_rounds = await get_active_rounds(db)
+    active_rounds, already_played = await asyncio.gather(
+        get_active_round_infos(db),
+        _has_played(round_id, user.id),
+    )
     round_obj = next((r for r in active_rounds if r.id == round_id), None)
 
     if not round_obj:
@@ -201,92 +278,27 @@ async def get_contest_game(
             detail="Contest round not found or already finished",
         )
 
-    if not round_obj.template or not round_obj.template.is_enabled:
+    if not round_obj.is_enabled:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="This contest is disabled",
         )
 
     # Check if already played
-    attempt = await get_attempt(db, round_id, user.id)
-    if attempt:
+    if already_played:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You have already played this round",
         )
 
-    tpl = round_obj.template
-    game_type = tpl.slug
-    game_data = {}
-    instructions = ""
-
-    if game_type == GAME_QUEST:
-        rows = round_obj.payload.get("rows", 3)
-        cols = round_obj.payload.get("cols", 3)
-        secret = random.randint(0, rows * cols - 1)
-        game_data = {
-            "rows": rows,
-            "cols": cols,
-            "secret": secret,
-            "grid_size": rows * cols,
-        }
-        instructions = "Select one of the nodes in the grid. Find the hidden server!"
-
-    elif game_type == GAME_LOCKS:
-        total = round_obj.payload.get("total", 20)
-        secret = random.randint(0, total - 1)
-        game_data = {
-            "total": total,
-            "secret": secret,
-        }
-        instructions = "Find the unlocked button among the locks!"
-
-    elif game_type == GAME_SERVER:
-        flags = round_obj.payload.get("flags") or []
-        shuffled_flags = flags.copy()
-        random.shuffle(shuffled_flags)
-        game_data = {
-            "flags": shuffled_flags,
-        }
-        instructions = "Choose a server by clicking on a flag!"
-
-    elif game_type == GAME_CIPHER:
-        question = round_obj.payload.get("question", "")
-        game_data = {
-            "question": question,
-            "input_type": "text",
-        }
-        instructions = "Decrypt the cipher and enter the answer!"
-
-    elif game_type == GAME_EMOJI:
-        question = round_obj.payload.get("question", "🤔")
-        emoji_list = question.split()
-        random.shuffle(emoji_list)
-        game_data = {
-            "question": " ".join(emoji_list),
-            "input_type": "text",
-        }
-        instructions = "Guess the service by emojis!"
-
-    elif game_type == GAME_ANAGRAM:
-        letters = round_obj.payload.get("letters", "")
-        game_data = {
-            "letters": letters,
-            "input_type": "text",
-        }
-        instructions = "Make a word from the given letters!"
-
-    elif game_type == GAME_BLITZ:
-        game_data = {
-            "button_text": "I'm here!",
-        }
-        instructions = "Click the button as fast as you can!"
-
-    else:
+    game_type = round_obj.slug
+    builder, instructions = _GAME_BUILDERS.get(game_type, (None, ""))
+    if builder is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unknown contest type",
         )
+    game_data = builder(round_obj.payload)
 
     return ContestGameData(
         round_id=round_id,
@@ -301,19 +313,20 @@ async def submit_contest_answer(
     round_id: int,
     request: ContestAnswerRequest,
     user: User = Depends(get_current_cabinet_user),
+    subscription: Optional[Subscription] = Depends(get_current_subscription),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Submit answer for a contest round."""
-    subscription = await get_subscription_by_user_id(db, user.id)
-
     if not _user_allowed(subscription):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Contests are only available for users with active or trial subscriptions",
         )
 
-    active_rounds = await get_active_rounds(db)
-    round_obj = next((r for r in active_rounds if r.id == round_id), None)
+    round_obj, already_played = await asyncio.gather(
+        get_active_round_by_id(db, round_id),
+        _has_played(round_id, user.id),
+    )
 
     if not round_obj:
         raise HTTPException(
@@ -322,8 +335,7 @@ async def submit_contest_answer(
         )
 
     # Check if already played
-    attempt = await get_attempt(db, round_id, user.id)
-    if attempt:
+    if already_played:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You have already played this round",
@@ -368,11 +380,12 @@ async def submit_contest_answer(
 
     if is_winner:
         await increment_winner_count(db, round_obj)
-        prize_text = await _award_prize(db, user.id, tpl.prize_days)
+        prize_days = get_prize_days(tpl)
+        prize_text = await _award_prize(db, subscription, prize_days)
         return ContestResult(
             is_winner=True,
             message=f"🎉 Congratulations! You won! {prize_text}",
-            prize_days=tpl.prize_days,
+            prize_days=prize_days,
         )
     else:
         lose_messages = {
@@ -383,5 +396,5 @@ async def submit_contest_answer(
         messages = lose_messages.get(tpl.slug, ["Incorrect", "Try again next round"])
         return ContestResult(
             is_winner=False,
-            message=random.choice(messages),
+            message=secrets.choice(messages),
         )
@@ -1,19 +1,24 @@
 """Info pages routes for cabinet - FAQ, rules, privacy policy, etc."""
 
+import hashlib
 import logging
-from typing import List, Optional, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models import User
 from app.config import settings
+from app.utils.cache import InfoPagesCache
 from app.services.faq_service import FaqService
 from app.services.privacy_policy_service import PrivacyPolicyService
 from app.services.public_offer_service import PublicOfferService
-from app.database.crud.rules import get_rules_by_language, get_current_rules_content
+from app.database.crud.rules import get_rules_record
 
 from ..dependencies import get_cabinet_db, get_current_cabinet_user, get_optional_cabinet_user
 
@@ -59,151 +64,219 @@ class ServiceInfoResponse(BaseModel):
     website: Optional[str] = None
 
 
+# ============ Helpers ============
+
+# Clients revalidate every time; unchanged pages cost a 304 with no body
+INFO_CACHE_CONTROL = "public, no-cache"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match against the current ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
+def _payload_etag(payload: Any) -> str:
+    return f'"{hashlib.sha1(orjson.dumps(payload)).hexdigest()}"'
+
+
+def _info_response(request: Request, etag: str, payload: Any) -> Response:
+    """JSON response with validators, or 304 if the client copy is current."""
+    headers = {"ETag": etag, "Cache-Control": INFO_CACHE_CONTROL}
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return ORJSONResponse(content=payload, headers=headers)
+
+
+async def _cached_info_response(
+    request: Request,
+    cache_parts: tuple,
+    build: Callable[[], Awaitable[Any]],
+) -> Response:
+    """Serve an info page from Redis, building and storing it on a miss.
+
+    The crud functions that edit these pages drop the whole info cache, so the
+    stored ETag changes exactly when the content does.
+    """
+    entry = await InfoPagesCache.get_page(*cache_parts)
+    if entry is None:
+        payload = jsonable_encoder(await build())
+        entry = {"etag": _payload_etag(payload), "payload": payload}
+        await InfoPagesCache.set_page(entry, *cache_parts)
+
+    return _info_response(request, entry["etag"], entry["payload"])
+
+
 # ============ Routes ============
 
 @router.get("/faq", response_model=List[FaqPageResponse])
 async def get_faq_pages(
+    request: Request,
     language: str = Query("ru", min_length=2, max_length=10),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get list of FAQ pages."""
     requested_lang = FaqService.normalize_language(language)
-    pages = await FaqService.get_pages(
-        db,
-        requested_lang,
-        include_inactive=False,  # Only active pages for cabinet
-        fallback=True,
-    )
-
-    return [
-        FaqPageResponse(
-            id=page.id,
-            title=page.title,
-            content=page.content or "",
-            order=page.display_order or 0,
+
+    async def build():
+        pages = await FaqService.get_pages(
+            db,
+            requested_lang,
+            include_inactive=False,  # Only active pages for cabinet
+            fallback=True,
         )
-        for page in pages
-    ]
+
+        return [
+            FaqPageResponse(
+                id=page.id,
+                title=page.title,
+                content=page.content or "",
+                order=page.display_order or 0,
+            )
+            for page in pages
+        ]
+
+    return await _cached_info_response(request, ("faq", requested_lang), build)
 
 
 @router.get("/faq/{page_id}", response_model=FaqPageResponse)
 async def get_faq_page(
+    request: Request,
     page_id: int,
     language: str = Query("ru", min_length=2, max_length=10),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get a specific FAQ page by ID."""
     requested_lang = FaqService.normalize_language(language)
-    page = await FaqService.get_page(
-        db,
-        page_id,
-        requested_lang,
-        include_inactive=False,
-        fallback=True,
-    )
-
-    if not page:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="FAQ page not found",
+
+    async def build():
+        page = await FaqService.get_page(
+            db,
+            page_id,
+            requested_lang,
+            include_inactive=False,
+            fallback=True,
         )
 
-    return FaqPageResponse(
-        id=page.id,
-        title=page.title,
-        content=page.content or "",
-        order=page.display_order or 0,
-    )
+        if not page:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="FAQ page not found",
+            )
+
+        return FaqPageResponse(
+            id=page.id,
+            title=page.title,
+            content=page.content or "",
+            order=page.display_order or 0,
+        )
+
+    return await _cached_info_response(request, ("faq", page_id, requested_lang), build)
 
 
 @router.get("/rules", response_model=RulesResponse)
 async def get_rules(
+    request: Request,
     language: str = Query("ru", min_length=2, max_length=10),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get service rules - uses same function as bot."""
     requested_lang = language.split("-")[0].lower()
 
-    # Use the same function as bot to ensure consistent content
-    content = await get_current_rules_content(db, requested_lang)
+    async def build():
+        # Same record and default text as the bot, content and updated_at in one query
+        content, rules_updated_at = await get_rules_record(db, requested_lang)
+        updated_at = rules_updated_at.isoformat() if rules_updated_at else None
 
-    # Try to get updated_at from DB record
-    rules = await get_rules_by_language(db, requested_lang)
-    updated_at = None
-    if rules and rules.updated_at:
-        updated_at = rules.updated_at.isoformat()
+        return RulesResponse(content=content, updated_at=updated_at)
 
-    return RulesResponse(content=content, updated_at=updated_at)
+    return await _cached_info_response(request, ("rules", requested_lang), build)
 
 
 @router.get("/privacy-policy", response_model=PrivacyPolicyResponse)
 async def get_privacy_policy(
+    request: Request,
     language: str = Query("ru", min_length=2, max_length=10),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get privacy policy."""
     requested_lang = PrivacyPolicyService.normalize_language(language)
-    policy = await PrivacyPolicyService.get_policy(db, requested_lang, fallback=True)
 
-    if policy and policy.content:
-        updated_at = policy.updated_at.isoformat() if policy.updated_at else None
-        return PrivacyPolicyResponse(content=policy.content, updated_at=updated_at)
+    async def build():
+        policy = await PrivacyPolicyService.get_policy(db, requested_lang, fallback=True)
 
-    # Return default policy if none found
-    return PrivacyPolicyResponse(
-        content="""# Политика конфиденциальности
+        if policy and policy.content:
+            updated_at = policy.updated_at.isoformat() if policy.updated_at else None
+            return PrivacyPolicyResponse(content=policy.content, updated_at=updated_at)
+
+        # Return default policy if none found
+        return PrivacyPolicyResponse(
+            content="""# Политика конфиденциальности
 
 Мы уважаем вашу конфиденциальность и защищаем ваши персональные данные.
 """,
-        updated_at=None,
-    )
+            updated_at=None,
+        )
+
+    return await _cached_info_response(request, ("privacy-policy", requested_lang), build)
 
 
 @router.get("/public-offer", response_model=PublicOfferResponse)
 async def get_public_offer(
+    request: Request,
     language: str = Query("ru", min_length=2, max_length=10),
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get public offer."""
     requested_lang = PublicOfferService.normalize_language(language)
-    offer = await PublicOfferService.get_offer(db, requested_lang, fallback=True)
 
-    if offer and offer.content:
-        updated_at = offer.updated_at.isoformat() if offer.updated_at else None
-        return PublicOfferResponse(content=offer.content, updated_at=updated_at)
+    async def build():
+        offer = await PublicOfferService.get_offer(db, requested_lang, fallback=True)
+
+        if offer and offer.content:
+            updated_at = offer.updated_at.isoformat() if offer.updated_at else None
+            return PublicOfferResponse(content=offer.content, updated_at=updated_at)
 
-    # Return default offer if none found
-    return PublicOfferResponse(
-        content="""# Публичная оферта
+        # Return default offer if none found
+        return PublicOfferResponse(
+            content="""# Публичная оферта
 
 Условия использования сервиса.
 """,
-        updated_at=None,
-    )
+            updated_at=None,
+        )
+
+    return await _cached_info_response(request, ("public-offer", requested_lang), build)
 
 
 @router.get("/service", response_model=ServiceInfoResponse)
-async def get_service_info():
+async def get_service_info(request: Request):
     """Get general service information."""
-    return ServiceInfoResponse(
+    # Built from settings, which can change at runtime, so only the ETag is added
+    payload = jsonable_encoder(ServiceInfoResponse(
         name=getattr(settings, 'SERVICE_NAME', None) or getattr(settings, 'BOT_NAME', 'VPN Service'),
         description=getattr(settings, 'SERVICE_DESCRIPTION', None),
         support_email=getattr(settings, 'SUPPORT_EMAIL', None),
         support_telegram=getattr(settings, 'SUPPORT_USERNAME', None) or getattr(settings, 'SUPPORT_TELEGRAM', None),
         website=getattr(settings, 'WEBSITE_URL', None),
-    )
+    ))
+    return _info_response(request, _payload_etag(payload), payload)
 
 
 @router.get("/languages")
-async def get_available_languages():
+async def get_available_languages(request: Request):
     """Get list of available languages."""
-    return {
+    payload = {
         "languages": [
             {"code": "ru", "name": "Русский", "flag": "🇷🇺"},
             {"code": "en", "name": "English", "flag": "🇬🇧"},
         ],
         "default": getattr(settings, 'DEFAULT_LANGUAGE', 'ru') or 'ru',
     }
+    return _info_response(request, _payload_etag(payload), payload)
 
 
 @router.get("/user/language")
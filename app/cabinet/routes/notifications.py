@@ -101,15 +101,12 @@ async def update_notification_settings(
     # Update settings
     new_settings = _update_notification_settings(user, updates)
 
-    # Store in user object
-    if not hasattr(user, 'notification_settings') or user.notification_settings is None:
-        user.notification_settings = {}
-
+    # Store in user object; the flush updates only these two columns
     user.notification_settings = new_settings
     user.updated_at = datetime.utcnow()
 
+    # new_settings is what was written, so the user row is not reloaded
     await db.commit()
-    await db.refresh(user)
 
     return NotificationSettingsResponse(**new_settings)
 
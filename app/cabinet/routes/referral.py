@@ -2,11 +2,13 @@
 
 import logging
 import math
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
+from sqlalchemy.orm import aliased
 
 from app.database.models import User, ReferralEarning
 from app.config import settings
@@ -25,6 +27,8 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/referral", tags=["Cabinet Referral"])
 
+_EARNING_LIST_ADAPTER = TypeAdapter(List[ReferralEarningResponse])
+
 
 @router.get("", response_model=ReferralInfoResponse)
 async def get_referral_info(
@@ -129,8 +133,23 @@ async def get_referral_earnings(
     db: AsyncSession = Depends(get_cabinet_db),
 ):
     """Get referral earnings history."""
-    # Base query
-    query = select(ReferralEarning).where(ReferralEarning.user_id == user.id)
+    # Base query - response fields computed in SQL, referral user joined in the same round-trip
+    referral_user = aliased(User)
+    query = (
+        select(
+            ReferralEarning.id,
+            ReferralEarning.amount_kopeks,
+            (ReferralEarning.amount_kopeks / 100.0).label("amount_rubles"),
+            func.coalesce(
+                func.nullif(ReferralEarning.reason, ""), "Referral commission"
+            ).label("reason"),
+            referral_user.username.label("referral_username"),
+            referral_user.first_name.label("referral_first_name"),
+            ReferralEarning.created_at,
+        )
+        .outerjoin(referral_user, referral_user.id == ReferralEarning.referral_id)
+        .where(ReferralEarning.user_id == user.id)
+    )
 
     # Get total count and sum
     count_query = select(func.count()).select_from(ReferralEarning).where(ReferralEarning.user_id == user.id)
@@ -149,24 +168,9 @@ async def get_referral_earnings(
     query = query.order_by(desc(ReferralEarning.created_at)).offset(offset).limit(per_page)
 
     result = await db.execute(query)
-    earnings = result.scalars().all()
-
-    items = []
-    for e in earnings:
-        # Get referral user info
-        referral_query = select(User).where(User.id == e.referral_id)
-        referral_result = await db.execute(referral_query)
-        referral_user = referral_result.scalar_one_or_none()
-
-        items.append(ReferralEarningResponse(
-            id=e.id,
-            amount_kopeks=e.amount_kopeks,
-            amount_rubles=e.amount_kopeks / 100,
-            reason=e.reason or "Referral commission",
-            referral_username=referral_user.username if referral_user else None,
-            referral_first_name=referral_user.first_name if referral_user else None,
-            created_at=e.created_at,
-        ))
+
+    # Column names match the response fields, so the page is validated in one call
+    items = _EARNING_LIST_ADAPTER.validate_python(result.mappings().all())
 
     pages = math.ceil(total / per_page) if total > 0 else 1
 
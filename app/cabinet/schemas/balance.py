@@ -28,12 +28,14 @@ class TransactionResponse(BaseModel):
 
 
 class TransactionListResponse(BaseModel):
-    """Paginated transaction list."""
+    """Paginated transaction list; total and pages are set only when include_total is requested."""
     items: List[TransactionResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     per_page: int
-    pages: int
+    pages: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
 
 
 class PaymentMethodResponse(BaseModel):
@@ -1,5 +1,18 @@
 """Cabinet services."""
 
 from .email_service import EmailService, email_service
+from .email_queue_service import (
+    EMAIL_KIND_PASSWORD_RESET,
+    EMAIL_KIND_VERIFICATION,
+    EmailQueueService,
+    email_queue_service,
+)
 
-__all__ = ["EmailService", "email_service"]
+__all__ = [
+    "EmailService",
+    "email_service",
+    "EmailQueueService",
+    "email_queue_service",
+    "EMAIL_KIND_VERIFICATION",
+    "EMAIL_KIND_PASSWORD_RESET",
+]
@@ -0,0 +1,322 @@
+"""Redis-backed delivery queue for cabinet emails.
+
+Routes push messages onto a Redis list and a single background worker sends
+them, so SMTP latency never occupies the request thread pool.
+
+Claimed messages are moved to a per-process processing list and removed only
+after the send attempt. A process keeps a heartbeat key alive while it runs;
+the processing list of a process whose heartbeat has expired is requeued by
+the next worker that looks, so a crash mid-batch re-delivers messages instead
+of losing them, and messages a live process is still sending are left alone. The messages carry raw email tokens, so both lists expire
+after the longest token lifetime.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.utils.cache import cache
+
+from .email_service import email_service
+
+logger = logging.getLogger(__name__)
+
+EMAIL_QUEUE_KEY = "cabinet:email_queue"
+EMAIL_PROCESSING_KEY = "cabinet:email_queue:processing"
+EMAIL_WORKER_KEY = "cabinet:email_queue:worker"
+
+# A worker is considered dead once its heartbeat has not been refreshed for this long
+_HEARTBEAT_TTL = 60
+_HEARTBEAT_INTERVAL = 20
+# Look for processing lists of dead workers every this many heartbeats
+_RECOVER_EVERY_HEARTBEATS = 15
+
+EMAIL_KIND_VERIFICATION = "verification"
+EMAIL_KIND_PASSWORD_RESET = "password_reset"
+
+# Move up to ARGV[1] messages from the queue tail to the processing list
+_CLAIM_SCRIPT = """
+local items = {}
+for i = 1, tonumber(ARGV[1]) do
+    local item = redis.call('RPOPLPUSH', KEYS[1], KEYS[2])
+    if not item then
+        break
+    end
+    items[#items + 1] = item
+end
+if #items > 0 then
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+end
+return items
+"""
+
+# Drop a claimed message; ARGV[2], when given, goes back onto the queue
+_ACK_SCRIPT = """
+redis.call('LREM', KEYS[1], 1, ARGV[1])
+if ARGV[2] ~= '' then
+    redis.call('LPUSH', KEYS[2], ARGV[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+return 1
+"""
+
+# Return messages left in processing by a dead worker, oldest first in line.
+# With ARGV[2] = '1' nothing is moved while the worker heartbeat KEYS[3] exists.
+_RECOVER_SCRIPT = """
+if ARGV[2] == '1' and redis.call('EXISTS', KEYS[3]) == 1 then
+    return 0
+end
+local moved = 0
+local item = redis.call('LPOP', KEYS[1])
+while item do
+    redis.call('RPUSH', KEYS[2], item)
+    moved = moved + 1
+    item = redis.call('LPOP', KEYS[1])
+end
+if moved > 0 then
+    redis.call('EXPIRE', KEYS[2], ARGV[1])
+end
+return moved
+"""
+
+
+def _token_lifetime_seconds(kind: Optional[str] = None) -> int:
+    """Lifetime of the token carried by an email of ``kind`` (the longest one by default)."""
+    verification = settings.get_cabinet_email_verification_expire_hours() * 3600
+    password_reset = settings.get_cabinet_password_reset_expire_hours() * 3600
+    if kind == EMAIL_KIND_VERIFICATION:
+        return verification
+    if kind == EMAIL_KIND_PASSWORD_RESET:
+        return password_reset
+    return max(verification, password_reset)
+
+
+class EmailQueueService:
+    """Background worker that drains the cabinet email queue."""
+
+    def __init__(
+        self,
+        poll_interval: float = 2.0,
+        batch_size: int = 20,
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+    ):
+        self._poll_interval = poll_interval
+        self._batch_size = batch_size
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._running = False
+
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._processing_key = f"{EMAIL_PROCESSING_KEY}:{worker_id}"
+        self._heartbeat_key = f"{EMAIL_WORKER_KEY}:{worker_id}"
+
+    def is_running(self) -> bool:
+        """Check whether the worker is consuming the queue."""
+        return self._running and self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the worker if SMTP is configured."""
+        if not email_service.is_configured():
+            logger.info("SMTP is not configured, cabinet email queue not started")
+            return
+
+        if self.is_running():
+            logger.warning("Cabinet email queue is already running")
+            return
+
+        await cache.set(self._heartbeat_key, time.time(), expire=_HEARTBEAT_TTL)
+        await self._recover_dead_workers()
+
+        self._running = True
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        self._task = asyncio.create_task(self._process_queue_loop())
+        logger.info("Cabinet email queue started")
+
+    async def stop(self) -> None:
+        """Stop the worker; queued messages stay in Redis for the next start."""
+        self._running = False
+        for task in (self._task, self._heartbeat_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._heartbeat_task = None
+        # Unsent claims of this process become recoverable by the other workers right away
+        await cache.delete(self._heartbeat_key)
+        logger.info("Cabinet email queue stopped")
+
+    async def enqueue(self, kind: str, **fields: Any) -> bool:
+        """
+        Queue an email for delivery.
+
+        Args:
+            kind: EMAIL_KIND_VERIFICATION or EMAIL_KIND_PASSWORD_RESET
+            **fields: Keyword arguments of the matching email_service sender
+
+        Returns:
+            True if the message was queued, False if the caller must send it itself
+            (worker not running or Redis unavailable)
+        """
+        if not self.is_running():
+            return False
+        message = {"kind": kind, "fields": fields, "attempts": 0, "queued_at": time.time()}
+        if not await cache.lpush(EMAIL_QUEUE_KEY, message):
+            return False
+        await cache.expire(EMAIL_QUEUE_KEY, _token_lifetime_seconds())
+        return True
+
+    async def _heartbeat_loop(self) -> None:
+        # Separate from the send loop, so a slow SMTP batch does not look like a dead worker
+        beats = 0
+        while self._running:
+            await asyncio.sleep(_HEARTBEAT_INTERVAL)
+            try:
+                await cache.set(self._heartbeat_key, time.time(), expire=_HEARTBEAT_TTL)
+                beats += 1
+                if beats % _RECOVER_EVERY_HEARTBEATS == 0:
+                    await self._recover_dead_workers()
+            except Exception as error:
+                logger.error(f"Cabinet email queue heartbeat error: {error}")
+
+    async def _recover_dead_workers(self) -> None:
+        """Requeue the processing lists of workers whose heartbeat has expired.
+
+        The list of this process is requeued too: at start it can only hold
+        leftovers of an earlier run with the same hostname and pid (a restarted
+        container), and afterwards the check is skipped for it.
+        """
+        prefix = f"{EMAIL_PROCESSING_KEY}:"
+        for processing_key in await cache.get_keys(f"{prefix}*"):
+            own = processing_key == self._processing_key
+            if own and self._running:
+                continue
+
+            # The heartbeat is checked inside the script, so a worker that is
+            # alive is never robbed because of a failed or stale check here
+            worker_id = processing_key[len(prefix):]
+            recovered = await cache.eval_script(
+                _RECOVER_SCRIPT,
+                [processing_key, EMAIL_QUEUE_KEY, f"{EMAIL_WORKER_KEY}:{worker_id}"],
+                [_token_lifetime_seconds(), "0" if own else "1"],
+            )
+            if recovered:
+                logger.warning(
+                    f"Requeued {int(recovered)} cabinet emails left unsent by worker {worker_id}"
+                )
+
+    async def _process_queue_loop(self) -> None:
+        while self._running:
+            try:
+                sent = await self._process_batch()
+            except Exception as error:
+                logger.error(f"Cabinet email queue error: {error}")
+                sent = 0
+
+            if sent < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
+
+    async def _process_batch(self) -> int:
+        claimed = await cache.eval_script(
+            _CLAIM_SCRIPT,
+            [EMAIL_QUEUE_KEY, self._processing_key],
+            [self._batch_size, _token_lifetime_seconds()],
+        )
+        if not claimed:
+            return 0
+
+        now = time.time()
+        batch = []
+        for raw in claimed:
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                logger.error("Dropping malformed cabinet email queue entry")
+                await self._ack(raw)
+                continue
+
+            if now - message.get("queued_at", now) > _token_lifetime_seconds(message.get("kind")):
+                logger.warning(
+                    f"Dropping cabinet email to {message.get('fields', {}).get('to_email')}: "
+                    f"its token has expired"
+                )
+                await self._ack(raw)
+            elif message.get("not_before", 0) > now:
+                # Waiting out the retry backoff
+                await self._ack(raw, requeue=raw)
+            else:
+                batch.append((raw, message))
+
+        if not batch:
+            return 0
+
+        # One thread hop per batch instead of one per message
+        failed = await asyncio.to_thread(self._deliver_batch, [message for _, message in batch])
+
+        for raw, message in batch:
+            if id(message) not in failed:
+                await self._ack(raw)
+                continue
+
+            message["attempts"] = message.get("attempts", 0) + 1
+            if message["attempts"] >= self._max_attempts:
+                logger.error(
+                    f"Dropping cabinet email to {message.get('fields', {}).get('to_email')} "
+                    f"after {message['attempts']} attempts"
+                )
+                await self._ack(raw)
+                continue
+
+            message["not_before"] = now + self._retry_delay * 2 ** (message["attempts"] - 1)
+            await self._ack(raw, requeue=json.dumps(message, default=str))
+
+        return len(batch)
+
+    async def _ack(self, raw: Any, requeue: Any = "") -> None:
+        """Remove a claimed message from the processing list, optionally queueing ``requeue``."""
+        await cache.eval_script(
+            _ACK_SCRIPT,
+            [self._processing_key, EMAIL_QUEUE_KEY],
+            [raw, requeue, _token_lifetime_seconds()],
+        )
+
+    @staticmethod
+    def _deliver_batch(batch: list) -> set:
+        """Send the messages; returns the ids of the ones that failed."""
+        failed = set()
+        for message in batch:
+            try:
+                sent = _send_message(message)
+            except Exception as error:
+                logger.error(f"Cabinet email send error: {error}")
+                sent = False
+            if not sent:
+                failed.add(id(message))
+        return failed
+
+
+def _send_message(message: Dict[str, Any]) -> bool:
+    kind = message.get("kind")
+    fields = message.get("fields") or {}
+
+    if kind == EMAIL_KIND_VERIFICATION:
+        return email_service.send_verification_email(**fields)
+    if kind == EMAIL_KIND_PASSWORD_RESET:
+        return email_service.send_password_reset_email(**fields)
+
+    logger.error(f"Unknown cabinet email kind: {kind}")
+    return True
+
+
+# Singleton instance
+email_queue_service = EmailQueueService()
@@ -70,6 +70,12 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "remnawave_bot"
     POSTGRES_USER: str = "remnawave_user" 
     POSTGRES_PASSWORD: str = "secure_password_123"
+
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 30
+    DATABASE_POOL_PRE_PING: bool = True
+    # Транзакционный режим PgBouncer не поддерживает prepared statements asyncpg
+    DATABASE_PGBOUNCER: bool = False
     
     SQLITE_PATH: str = "./data/bot.db"
     LOCALES_PATH: str = "./locales"
@@ -525,6 +531,8 @@ class Settings(BaseSettings):
     CABINET_ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     CABINET_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     CABINET_ALLOWED_ORIGINS: str = ""
+    CABINET_URL: Optional[str] = None
+    CABINET_TRUSTED_PROXY_NETWORKS: str = ""
     CABINET_EMAIL_VERIFICATION_ENABLED: bool = True
     CABINET_EMAIL_VERIFICATION_EXPIRE_HOURS: int = 24
     CABINET_PASSWORD_RESET_EXPIRE_HOURS: int = 1
@@ -2110,6 +2118,15 @@ class Settings(BaseSettings):
             return []
         return [o.strip() for o in self.CABINET_ALLOWED_ORIGINS.split(",") if o.strip()]
 
+    def get_cabinet_url(self) -> str:
+        if self.CABINET_URL:
+            return self.CABINET_URL.strip().rstrip("/")
+        # The wildcard origin is valid for CORS but is not an address to link to
+        for origin in self.get_cabinet_allowed_origins():
+            if origin != "*":
+                return origin.rstrip("/")
+        return ""
+
     def is_cabinet_email_verification_enabled(self) -> bool:
         return bool(self.CABINET_EMAIL_VERIFICATION_ENABLED)
 
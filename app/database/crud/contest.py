@@ -1,15 +1,41 @@
 import logging
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 from sqlalchemy import and_, delete, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 
 from app.database.models import ContestTemplate, ContestRound, ContestAttempt, User
+from app.utils.cache import cache
 
 logger = logging.getLogger(__name__)
 
+# Active rounds change only on rotation or admin edits, which drop the key below;
+# the TTL bounds staleness for anything that bypasses these functions.
+ACTIVE_ROUNDS_CACHE_KEY = "contests:active_rounds"
+ACTIVE_ROUNDS_CACHE_TTL = 45
+
+
+@dataclass(frozen=True)
+class ActiveRoundInfo:
+    """Read-only view of an active round and its template, as cached in Redis."""
+
+    id: int
+    slug: str
+    name: str
+    description: Optional[str]
+    prize_days: int
+    is_enabled: bool
+    payload: Dict[str, Any]
+    starts_at: datetime
+    ends_at: datetime
+
+
+async def invalidate_active_rounds_cache() -> None:
+    await cache.delete(ACTIVE_ROUNDS_CACHE_KEY)
+
 
 # Templates
 async def get_template_by_id(db: AsyncSession, template_id: int) -> Optional[ContestTemplate]:
@@ -69,6 +95,7 @@ async def upsert_template(
         template.is_enabled = is_enabled
     await db.commit()
     await db.refresh(template)
+    await invalidate_active_rounds_cache()
     return template
 
 
@@ -82,6 +109,7 @@ async def update_template_fields(
             setattr(template, key, value)
     await db.commit()
     await db.refresh(template)
+    await invalidate_active_rounds_cache()
     return template
 
 
@@ -106,6 +134,7 @@ async def create_round(
     db.add(round_obj)
     await db.commit()
     await db.refresh(round_obj)
+    await invalidate_active_rounds_cache()
     return round_obj
 
 
@@ -113,7 +142,7 @@ async def get_active_rounds(db: AsyncSession) -> List[ContestRound]:
     now = datetime.utcnow()
     result = await db.execute(
         select(ContestRound)
-        .options(selectinload(ContestRound.template))
+        .options(joinedload(ContestRound.template))
         .where(
             and_(
                 ContestRound.status == "active",
@@ -126,11 +155,80 @@ async def get_active_rounds(db: AsyncSession) -> List[ContestRound]:
     return list(result.scalars().all())
 
 
+async def get_active_round_by_id(db: AsyncSession, round_id: int) -> Optional[ContestRound]:
+    now = datetime.utcnow()
+    result = await db.execute(
+        select(ContestRound)
+        .options(joinedload(ContestRound.template))
+        .where(
+            and_(
+                ContestRound.id == round_id,
+                ContestRound.status == "active",
+                ContestRound.starts_at <= now,
+                ContestRound.ends_at >= now,
+            )
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+def get_prize_days(template: ContestTemplate) -> int:
+    if template.prize_type != "days":
+        return 0
+    try:
+        return int(template.prize_value)
+    except (TypeError, ValueError):
+        return 0
+
+
+async def get_active_round_infos(db: AsyncSession) -> List[ActiveRoundInfo]:
+    """Active rounds for read-only listings, served from Redis when possible."""
+    cached = await cache.get(ACTIVE_ROUNDS_CACHE_KEY)
+    if cached is None:
+        # Rounds that have not started yet are cached too and filtered by time below,
+        # so a round starting within the TTL shows up without waiting for expiry.
+        result = await db.execute(
+            select(ContestRound)
+            .options(joinedload(ContestRound.template))
+            .where(
+                and_(
+                    ContestRound.status == "active",
+                    ContestRound.ends_at >= datetime.utcnow(),
+                )
+            )
+            .order_by(ContestRound.starts_at)
+        )
+        cached = [
+            {
+                "id": rnd.id,
+                "slug": rnd.template.slug,
+                "name": rnd.template.name,
+                "description": rnd.template.description,
+                "prize_days": get_prize_days(rnd.template),
+                "is_enabled": rnd.template.is_enabled,
+                "payload": rnd.payload or {},
+                "starts_at": rnd.starts_at.isoformat(),
+                "ends_at": rnd.ends_at.isoformat(),
+            }
+            for rnd in result.scalars().all()
+        ]
+        await cache.set(ACTIVE_ROUNDS_CACHE_KEY, cached, ACTIVE_ROUNDS_CACHE_TTL)
+
+    now = datetime.utcnow()
+    rounds = []
+    for item in cached:
+        starts_at = datetime.fromisoformat(item["starts_at"])
+        ends_at = datetime.fromisoformat(item["ends_at"])
+        if starts_at <= now <= ends_at:
+            rounds.append(ActiveRoundInfo(**dict(item, starts_at=starts_at, ends_at=ends_at)))
+    return rounds
+
+
 async def get_active_round_by_template(db: AsyncSession, template_id: int) -> Optional[ContestRound]:
     now = datetime.utcnow()
     result = await db.execute(
         select(ContestRound)
-        .options(selectinload(ContestRound.template))
+        .options(joinedload(ContestRound.template))
         .where(
             and_(
                 ContestRound.template_id == template_id,
@@ -148,6 +246,7 @@ async def finish_round(db: AsyncSession, round_obj: ContestRound) -> ContestRoun
     round_obj.status = "finished"
     await db.commit()
     await db.refresh(round_obj)
+    await invalidate_active_rounds_cache()
     return round_obj
 
 
@@ -171,6 +270,21 @@ async def get_attempt(db: AsyncSession, round_id: int, user_id: int) -> Optional
     return result.scalar_one_or_none()
 
 
+async def get_attempts_for_rounds(db: AsyncSession, round_ids: List[int], user_id: int) -> Set[int]:
+    """IDs of the given rounds the user has already played, in one query."""
+    if not round_ids:
+        return set()
+    result = await db.execute(
+        select(ContestAttempt.round_id).where(
+            and_(
+                ContestAttempt.round_id.in_(round_ids),
+                ContestAttempt.user_id == user_id,
+            )
+        )
+    )
+    return set(result.scalars().all())
+
+
 async def create_attempt(
     db: AsyncSession,
     *,
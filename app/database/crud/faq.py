@@ -6,6 +6,7 @@ from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models import FaqPage, FaqSetting
+from app.utils.cache import InfoPagesCache
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,7 @@ async def set_faq_enabled(db: AsyncSession, language: str, enabled: bool) -> Faq
 
     await db.commit()
     await db.refresh(setting)
+    await InfoPagesCache.invalidate()
 
     logger.info(
         "✅ Статус FAQ для языка %s обновлен: %s",
@@ -96,6 +98,7 @@ async def create_faq_page(
     db.add(page)
     await db.commit()
     await db.refresh(page)
+    await InfoPagesCache.invalidate()
 
     logger.info("✅ Создана страница FAQ %s для языка %s", page.id, language)
 
@@ -124,6 +127,7 @@ async def update_faq_page(
 
     await db.commit()
     await db.refresh(page)
+    await InfoPagesCache.invalidate()
 
     logger.info("✅ Страница FAQ %s обновлена", page.id)
 
@@ -133,6 +137,7 @@ async def update_faq_page(
 async def delete_faq_page(db: AsyncSession, page_id: int) -> None:
     await db.execute(delete(FaqPage).where(FaqPage.id == page_id))
     await db.commit()
+    await InfoPagesCache.invalidate()
     logger.info("🗑️ Страница FAQ %s удалена", page_id)
 
 
@@ -147,4 +152,5 @@ async def bulk_update_order(
             .values(display_order=order, updated_at=datetime.utcnow())
         )
     await db.commit()
+    await InfoPagesCache.invalidate()
 
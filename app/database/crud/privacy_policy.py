@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models import PrivacyPolicy
+from app.utils.cache import InfoPagesCache
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,7 @@ async def upsert_privacy_policy(
 
     await db.commit()
     await db.refresh(policy)
+    await InfoPagesCache.invalidate()
 
     logger.info(
         "✅ Политика конфиденциальности для языка %s обновлена (ID: %s)",
@@ -69,6 +71,7 @@ async def set_privacy_policy_enabled(
 
     await db.commit()
     await db.refresh(policy)
+    await InfoPagesCache.invalidate()
 
     logger.info(
         "✅ Статус политики конфиденциальности для языка %s обновлен: %s",
@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models import PublicOffer
+from app.utils.cache import InfoPagesCache
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,7 @@ async def upsert_public_offer(
 
     await db.commit()
     await db.refresh(offer)
+    await InfoPagesCache.invalidate()
 
     logger.info(
         "✅ Публичная оферта для языка %s обновлена (ID: %s)",
@@ -69,6 +71,7 @@ async def set_public_offer_enabled(
 
     await db.commit()
     await db.refresh(offer)
+    await InfoPagesCache.invalidate()
 
     logger.info(
         "✅ Статус публичной оферты для языка %s обновлен: %s",
@@ -1,13 +1,32 @@
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
 from app.database.models import ServiceRule
+from app.utils.cache import InfoPagesCache
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_RULES_CONTENT = """
+🔒 <b>Правила использования сервиса</b>
+
+1. Сервис предоставляется "как есть" без каких-либо гарантий.
+
+2. Запрещается использование сервиса для незаконных действий.
+
+3. Администрация оставляет за собой право заблокировать доступ пользователя при нарушении правил.
+
+4. Возврат средств осуществляется в соответствии с политикой возврата.
+
+5. Пользователь несет полную ответственность за безопасность своего аккаунта.
+
+6. При возникновении вопросов обращайтесь в техническую поддержку.
+
+Используя сервис, вы соглашаетесь с данными правилами.
+"""
+
 
 async def get_rules_by_language(db: AsyncSession, language: str = "ru") -> Optional[ServiceRule]:
     result = await db.execute(
@@ -52,6 +71,7 @@ async def create_or_update_rules(
     db.add(new_rules)
     await db.commit()
     await db.refresh(new_rules)
+    await InfoPagesCache.invalidate()
     
     logger.info(f"✅ Правила для языка {language} обновлены (ID: {new_rules.id})")
     return new_rules
@@ -72,6 +92,7 @@ async def clear_all_rules(db: AsyncSession, language: str = "ru") -> bool:
         )
         
         await db.commit()
+        await InfoPagesCache.invalidate()
         
         rows_affected = result.rowcount
         logger.info(f"✅ Очищены правила для языка {language}. Деактивировано записей: {rows_affected}")
@@ -90,23 +111,27 @@ async def get_current_rules_content(db: AsyncSession, language: str = "ru") -> s
     if rules:
         return rules.content
     else:
-        return """
-🔒 <b>Правила использования сервиса</b>
-
-1. Сервис предоставляется "как есть" без каких-либо гарантий.
-
-2. Запрещается использование сервиса для незаконных действий.
-
-3. Администрация оставляет за собой право заблокировать доступ пользователя при нарушении правил.
+        return DEFAULT_RULES_CONTENT
 
-4. Возврат средств осуществляется в соответствии с политикой возврата.
-
-5. Пользователь несет полную ответственность за безопасность своего аккаунта.
 
-6. При возникновении вопросов обращайтесь в техническую поддержку.
-
-Используя сервис, вы соглашаетесь с данными правилами.
-"""
+async def get_rules_record(
+    db: AsyncSession,
+    language: str = "ru"
+) -> Tuple[str, Optional[datetime]]:
+    result = await db.execute(
+        select(ServiceRule.content, ServiceRule.updated_at)
+        .where(
+            ServiceRule.language == language,
+            ServiceRule.is_active == True
+        )
+        .order_by(ServiceRule.order, ServiceRule.created_at.desc())
+        .limit(1)
+    )
+    row = result.first()
+    
+    if row:
+        return row.content, row.updated_at
+    return DEFAULT_RULES_CONTENT, None
 
 
 async def get_all_rules_versions(
@@ -164,6 +189,7 @@ async def restore_rules_version(
         db.add(restored_rule)
         await db.commit()
         await db.refresh(restored_rule)
+        await InfoPagesCache.invalidate()
         
         logger.info(f"✅ Восстановлена версия правил ID {rule_id} как новое правило ID {restored_rule.id}")
         return restored_rule
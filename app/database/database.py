@@ -40,11 +40,13 @@ if IS_SQLITE:
 else:
     poolclass = AsyncAdaptedQueuePool
     pool_kwargs = {
-        "pool_size": 20,
-        "max_overflow": 30,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
         "pool_timeout": 30,
-        "pool_recycle": 3600,
-        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        # LIFO держит в работе «горячие» соединения, лишние простаивают и пересоздаются по pool_recycle
+        "pool_use_lifo": True,
         # Агрессивная очистка мертвых соединений
         "pool_reset_on_return": "rollback",
     }
@@ -65,6 +67,11 @@ _pg_connect_args = {
     "timeout": 10,
 }
 
+if settings.DATABASE_PGBOUNCER:
+    # PgBouncer в режиме transaction pooling не сохраняет prepared statements между транзакциями
+    _pg_connect_args["statement_cache_size"] = 0
+    _pg_connect_args["prepared_statement_cache_size"] = 0
+
 engine = create_async_engine(
     DATABASE_URL,
     poolclass=poolclass,
@@ -465,6 +472,20 @@ async def init_db():
         async with engine.begin() as conn:
             indexes = [
                 ("users", "CREATE INDEX IF NOT EXISTS idx_users_telegram_id ON users(telegram_id)"),
+                (
+                    "users",
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users(email) WHERE email IS NOT NULL",
+                ),
+                (
+                    "users",
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_verification_token ON users(email_verification_token) "
+                    "WHERE email_verification_token IS NOT NULL",
+                ),
+                (
+                    "users",
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_password_reset_token ON users(password_reset_token) "
+                    "WHERE password_reset_token IS NOT NULL",
+                ),
                 (
                     "subscriptions",
                     "CREATE INDEX IF NOT EXISTS idx_subscriptions_user_id ON subscriptions(user_id)",
@@ -477,8 +498,52 @@ async def init_db():
                     "payments",
                     "CREATE INDEX IF NOT EXISTS idx_payments_created_at ON payments(created_at DESC)",
                 ),
+                (
+                    "tickets",
+                    "CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status)",
+                ),
+                (
+                    "tickets",
+                    "CREATE INDEX IF NOT EXISTS idx_tickets_updated_at_id ON tickets(updated_at DESC, id DESC)",
+                ),
+                (
+                    "tickets",
+                    "CREATE INDEX IF NOT EXISTS idx_tickets_status_not_closed ON tickets(status) WHERE status <> 'closed'",
+                ),
+                (
+                    "tickets",
+                    "CREATE INDEX IF NOT EXISTS idx_tickets_not_closed_updated_at_id "
+                    "ON tickets(updated_at DESC, id DESC) WHERE status <> 'closed'",
+                ),
+                (
+                    "cabinet_refresh_tokens",
+                    "CREATE INDEX IF NOT EXISTS idx_crt_hash_active ON cabinet_refresh_tokens(token_hash) "
+                    "INCLUDE (user_id, expires_at) WHERE revoked_at IS NULL",
+                ),
+                (
+                    "transactions",
+                    "CREATE INDEX IF NOT EXISTS idx_transactions_user_created_cover "
+                    "ON transactions(user_id, created_at DESC, id DESC) "
+                    "INCLUDE (type, amount_kopeks, payment_method, is_completed, completed_at)",
+                ),
             ]
 
+            if await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("users")):
+                duplicate_emails = (
+                    await conn.execute(
+                        text(
+                            "SELECT email FROM users WHERE email IS NOT NULL "
+                            "GROUP BY email HAVING COUNT(*) > 1 LIMIT 10"
+                        )
+                    )
+                ).scalars().all()
+                if duplicate_emails:
+                    logger.warning(
+                        "⚠️ Email привязан к нескольким пользователям, уникальный индекс idx_users_email "
+                        "не будет создан до устранения дублей: %s",
+                        ", ".join(duplicate_emails),
+                    )
+
             for table_name, index_sql in indexes:
                 table_exists = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(table_name))
 
@@ -491,7 +556,9 @@ async def init_db():
                     continue
 
                 try:
-                    await conn.execute(text(index_sql))
+                    # A failed statement must not abort the remaining indexes
+                    async with conn.begin_nested():
+                        await conn.execute(text(index_sql))
                 except Exception as e:
                     logger.debug("Index creation skipped for %s: %s", table_name, e)
 
@@ -19,6 +19,7 @@ from sqlalchemy import (
     Index,
     Table,
     SmallInteger,
+    text,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -1922,14 +1923,19 @@ class Ticket(Base):
     user_reply_block_until = Column(DateTime, nullable=True)
     
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     closed_at = Column(DateTime, nullable=True)
     # SLA reminders
     last_sla_reminder_at = Column(DateTime, nullable=True)
     
     # Связи
     user = relationship("User", backref="tickets")
-    messages = relationship("TicketMessage", back_populates="ticket", cascade="all, delete-orphan")
+    messages = relationship(
+        "TicketMessage",
+        back_populates="ticket",
+        cascade="all, delete-orphan",
+        order_by="TicketMessage.created_at",
+    )
     
     @property
     def is_open(self) -> bool:
@@ -2181,6 +2187,12 @@ class CabinetRefreshToken(Base):
     __tablename__ = "cabinet_refresh_tokens"
     __table_args__ = (
         Index("ix_cabinet_refresh_tokens_user", "user_id"),
+        Index(
+            "idx_crt_hash_active",
+            "token_hash",
+            postgresql_where=text("revoked_at IS NULL"),
+            postgresql_include=["user_id", "expires_at"],
+        ),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -1445,6 +1445,37 @@ class BotConfigurationService:
                         "Не удалось обновить конфигурацию сервиса автосинхронизации RemnaWave: %s",
                         error,
                     )
+            elif key.startswith(
+                (
+                    "YOOKASSA_",
+                    "CRYPTOBOT_",
+                    "TELEGRAM_STARS_",
+                    "HELEKET_",
+                    "MULENPAY_",
+                    "PAL24_",
+                    "PLATEGA_",
+                    "WATA_",
+                )
+            ):
+                try:
+                    from app.cabinet.routes.balance import reset_payment_methods_cache
+
+                    reset_payment_methods_cache()
+                except Exception as error:
+                    logger.error(
+                        "Не удалось сбросить кеш способов оплаты кабинета: %s",
+                        error,
+                    )
+            elif key == "CABINET_JWT_SECRET":
+                try:
+                    from app.cabinet.auth.jwt_handler import reset_jwt_secret_cache
+
+                    reset_jwt_secret_cache()
+                except Exception as error:
+                    logger.error(
+                        "Не удалось сбросить кеш секрета JWT кабинета: %s",
+                        error,
+                    )
         except Exception as error:
             logger.error("Не удалось применить значение %s=%s: %s", key, value, error)
 
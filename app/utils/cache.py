@@ -1,5 +1,6 @@
 import json
 import logging
+import time
 from typing import Any, Optional, Union
 from datetime import datetime, timedelta
 import redis.asyncio as redis
@@ -236,6 +237,17 @@ class CacheService:
             logger.error(f"Ошибка получения длины очереди {key}: {e}")
             return 0
 
+    async def eval_script(self, script: str, keys: list, args: list) -> Optional[Any]:
+        """Выполнить Lua-скрипт атомарно на стороне Redis."""
+        if not self._connected:
+            return None
+
+        try:
+            return await self.redis_client.eval(script, len(keys), *keys, *args)
+        except Exception as e:
+            logger.error(f"Ошибка выполнения скрипта для {keys}: {e}")
+            return None
+
     async def lrange(self, key: str, start: int = 0, end: int = -1) -> list:
         """Получить элементы списка без удаления."""
         if not self._connected:
@@ -338,6 +350,24 @@ class SystemCache:
         return await cache.set(key, stats, 86400)  # 24 часа
 
 
+class InfoPagesCache:
+    # FAQ, правила, политика и оферта: сбрасываются целиком при любом изменении
+    
+    @staticmethod
+    async def get_page(*parts) -> Optional[dict]:
+        key = cache_key("info", *parts)
+        return await cache.get(key)
+    
+    @staticmethod
+    async def set_page(data: dict, *parts, expire: int = 300) -> bool:
+        key = cache_key("info", *parts)
+        return await cache.set(key, data, expire)
+    
+    @staticmethod
+    async def invalidate() -> int:
+        return await cache.delete_pattern(cache_key("info", "*"))
+
+
 class RateLimitCache:
     
     @staticmethod
@@ -358,4 +388,57 @@ class RateLimitCache:
     @staticmethod
     async def reset_rate_limit(user_id: int, action: str) -> bool:
         key = cache_key("rate_limit", user_id, action)
-        return await cache.delete(key)
\ No newline at end of file
+        return await cache.delete(key)
+
+
+# Пополнение и списание токена за один атомарный вызов
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return allowed
+"""
+
+
+class TokenBucketLimiter:
+    """Token bucket: capacity запросов, пополняется равномерно за period секунд.
+
+    Состояние хранится в Redis; без Redis используется локальный bucket процесса.
+    """
+
+    _local: dict = {}
+    _LOCAL_MAX_KEYS = 10000
+
+    @classmethod
+    async def consume(cls, key: str, capacity: int, period: int) -> bool:
+        """Списать токен. Возвращает False, если лимит исчерпан."""
+        rate = capacity / period
+        now = time.time()
+        redis_key = cache_key("token_bucket", key)
+
+        allowed = await cache.eval_script(_TOKEN_BUCKET_SCRIPT, [redis_key], [capacity, rate, now])
+        if allowed is not None:
+            return bool(int(allowed))
+
+        tokens, ts, _ = cls._local.get(redis_key, (capacity, now, now))
+        tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        if len(cls._local) >= cls._LOCAL_MAX_KEYS and redis_key not in cls._local:
+            # Полностью восстановившиеся buckets не несут состояния, их можно отбросить
+            cls._local = {k: v for k, v in cls._local.items() if v[2] > now}
+        cls._local[redis_key] = (tokens, now, now + (capacity - tokens) / rate)
+        return allowed
@@ -96,6 +96,23 @@ def _mount_miniapp_static(app: FastAPI) -> tuple[bool, Path]:
     return True, static_path
 
 
+def _mount_cabinet_branding_static(app: FastAPI) -> bool:
+    if not settings.is_cabinet_enabled():
+        return False
+
+    from app.cabinet.routes.branding import BRANDING_DIR, BRANDING_STATIC_URL, ensure_branding_dir
+
+    try:
+        ensure_branding_dir()
+        app.mount(BRANDING_STATIC_URL, StaticFiles(directory=BRANDING_DIR), name="cabinet-branding-static")
+        logger.info("🎨 Cabinet branding files mounted at %s from %s", BRANDING_STATIC_URL, BRANDING_DIR)
+    except (OSError, RuntimeError) as error:  # pragma: no cover - defensive guard
+        logger.warning("Не удалось смонтировать файлы брендинга кабинета: %s", error)
+        return False
+
+    return True
+
+
 def create_unified_app(
     bot: Bot,
     dispatcher: Dispatcher,
@@ -146,6 +163,7 @@ def create_unified_app(
         telegram_processor = None
 
     miniapp_mounted, miniapp_path = _mount_miniapp_static(app)
+    _mount_cabinet_branding_static(app)
 
     unified_health_path = "/health/unified" if settings.is_web_api_enabled() else "/health"
 
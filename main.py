@@ -35,6 +35,7 @@ from app.services.broadcast_service import broadcast_service
 from app.services.referral_contest_service import referral_contest_service
 from app.services.contest_rotation_service import contest_rotation_service
 from app.services.nalogo_queue_service import nalogo_queue_service
+from app.cabinet.services.email_queue_service import email_queue_service
 from app.utils.startup_timeline import StartupTimeline
 from app.utils.timezone import TimezoneAwareFormatter
 from app.utils.log_handlers import LevelFilterHandler, ExcludePaymentFilter
@@ -451,6 +452,22 @@ async def main():
             else:
                 stage.skip("NaloGO отключен настройками")
 
+        async with timeline.stage(
+            "Очередь писем кабинета",
+            "✉️",
+            success_message="Очередь писем запущена",
+        ) as stage:
+            if settings.is_cabinet_enabled() and settings.is_smtp_configured():
+                try:
+                    await email_queue_service.start()
+                    if not email_queue_service.is_running():
+                        stage.skip("Сервис не запущен")
+                except Exception as e:
+                    stage.warning(f"Ошибка запуска очереди писем: {e}")
+                    logger.error(f"❌ Ошибка запуска очереди писем кабинета: {e}")
+            else:
+                stage.skip("Кабинет или SMTP не настроены")
+
         async with timeline.stage(
             "Внешняя админка",
             "🛡️",
@@ -779,6 +796,12 @@ async def main():
         except Exception as e:
             logger.error(f"Ошибка остановки очереди чеков NaloGO: {e}")
 
+        logger.info("ℹ️ Остановка очереди писем кабинета...")
+        try:
+            await email_queue_service.stop()
+        except Exception as e:
+            logger.error(f"Ошибка остановки очереди писем кабинета: {e}")
+
         logger.info("ℹ️ Остановка сервиса бекапов...")
         try:
             await backup_service.stop_auto_backup()
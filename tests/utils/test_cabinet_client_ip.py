@@ -0,0 +1,44 @@
+"""Тесты определения IP клиента кабинета за обратным прокси."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.cabinet import dependencies
+from app.cabinet.dependencies import get_client_ip
+
+
+def _request(peer, forwarded=None):
+    headers = {"x-forwarded-for": forwarded} if forwarded else {}
+    return SimpleNamespace(client=SimpleNamespace(host=peer), headers=headers)
+
+
+@pytest.fixture(autouse=True)
+def trusted_networks(monkeypatch):
+    monkeypatch.setattr(dependencies.settings, "CABINET_TRUSTED_PROXY_NETWORKS", "172.18.0.0/16, 203.0.113.0/24")
+
+
+def test_forwarded_header_used_behind_configured_proxy() -> None:
+    """За прокси из настроенной docker-сети клиентом считается адрес из X-Forwarded-For."""
+    assert get_client_ip(_request("172.18.0.2", "8.8.8.8")) == "8.8.8.8"
+
+
+def test_forwarded_header_used_behind_loopback_proxy() -> None:
+    """Прокси на том же хосте доверен без настройки."""
+    assert get_client_ip(_request("127.0.0.1", "8.8.8.8")) == "8.8.8.8"
+
+
+def test_private_peer_not_trusted_by_default() -> None:
+    """Соседний узел в локальной сети не может подменить свой адрес заголовком."""
+    assert get_client_ip(_request("192.168.1.50", "1.1.1.1")) == "192.168.1.50"
+
+
+def test_forwarded_header_ignored_from_public_peer() -> None:
+    """Заголовок от недоверенного узла не может подменить адрес."""
+    assert get_client_ip(_request("8.8.4.4", "1.1.1.1")) == "8.8.4.4"
+
+
+def test_configured_proxy_hops_are_skipped() -> None:
+    """Доверенные сети из настроек пропускаются, подделанный левый адрес не используется."""
+    request = _request("172.18.0.2", "1.1.1.1, 9.9.9.9, 203.0.113.5")
+    assert get_client_ip(request) == "9.9.9.9"
@@ -0,0 +1,74 @@
+"""Тесты HS256-токенов кабинета из app.cabinet.auth.jwt_handler."""
+
+import base64
+import json
+
+import jwt
+import pytest
+
+from app.cabinet.auth import jwt_handler
+from app.cabinet.auth.jwt_handler import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    get_token_payload,
+)
+
+SECRET = "cabinet-test-secret"
+
+
+@pytest.fixture(autouse=True)
+def jwt_secret(monkeypatch):
+    monkeypatch.setattr(jwt_handler.settings, "CABINET_JWT_SECRET", SECRET)
+    jwt_handler.reset_jwt_secret_cache()
+    yield
+    jwt_handler.reset_jwt_secret_cache()
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def test_access_token_decodes_with_pyjwt() -> None:
+    """Токен собственной сборки читается обычным jwt.decode."""
+    token = create_access_token(user_id=42, telegram_id=777)
+
+    payload = jwt.decode(token, SECRET, algorithms=["HS256"])
+
+    assert payload["sub"] == "42"
+    assert payload["telegram_id"] == 777
+    assert payload["type"] == "access"
+    assert payload["exp"] > payload["iat"]
+    assert jwt.get_unverified_header(token) == {"alg": "HS256", "typ": "JWT"}
+
+
+def test_wrong_secret_is_rejected() -> None:
+    """Подпись другим секретом не проходит проверку."""
+    token = create_access_token(user_id=42, telegram_id=777)
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        jwt.decode(token, "another-secret", algorithms=["HS256"])
+
+    forged = jwt.encode({"sub": "42", "type": "access"}, "another-secret", algorithm="HS256")
+    assert decode_token(forged) is None
+
+
+def test_tampered_payload_is_rejected() -> None:
+    """Изменённая полезная нагрузка со старой подписью отклоняется."""
+    header, _, signature = create_access_token(user_id=42, telegram_id=777).split(".")
+    payload = json.dumps({"sub": "1", "telegram_id": 1, "type": "access", "exp": 4102444800, "iat": 0})
+    tampered = f"{header}.{_b64url(payload.encode())}.{signature}"
+
+    assert decode_token(tampered) is None
+    assert get_token_payload(tampered, expected_type="access") is None
+
+
+def test_token_type_is_checked() -> None:
+    """get_token_payload не принимает токен другого типа."""
+    access = create_access_token(user_id=42, telegram_id=777)
+    refresh = create_refresh_token(user_id=42)
+
+    assert get_token_payload(access, expected_type="access")["sub"] == "42"
+    assert get_token_payload(access, expected_type="refresh") is None
+    assert get_token_payload(refresh, expected_type="access") is None
+    assert get_token_payload(refresh, expected_type="refresh")["type"] == "refresh"
@@ -0,0 +1,46 @@
+"""Тесты хеширования паролей кабинета (Argon2id с поддержкой старых bcrypt-хешей)."""
+
+import bcrypt
+import pytest
+
+from app.cabinet.auth.password_utils import (
+    hash_password,
+    password_needs_rehash,
+    verify_password,
+)
+
+
+@pytest.fixture
+def bcrypt_hash() -> str:
+    return bcrypt.hashpw(b"legacy-password", bcrypt.gensalt(rounds=4)).decode("utf-8")
+
+
+def test_legacy_bcrypt_hash_still_verifies(bcrypt_hash) -> None:
+    """Пароли, сохранённые до перехода на Argon2id, продолжают проходить проверку."""
+    assert bcrypt_hash.startswith("$2b$")
+    assert verify_password("legacy-password", bcrypt_hash)
+    assert not verify_password("wrong-password", bcrypt_hash)
+
+
+def test_argon2_hash_round_trip() -> None:
+    """Новый хеш создаётся в формате Argon2id и проверяется."""
+    password_hash = hash_password("new-password")
+
+    assert password_hash.startswith("$argon2id$")
+    assert verify_password("new-password", password_hash)
+    assert not verify_password("wrong-password", password_hash)
+
+
+def test_rehash_needed_only_for_legacy_hashes(bcrypt_hash) -> None:
+    """bcrypt-хеш требует перехеширования, свежий Argon2id — нет."""
+    assert password_needs_rehash(bcrypt_hash)
+    assert not password_needs_rehash(hash_password("new-password"))
+
+
+@pytest.mark.parametrize(
+    "malformed_hash",
+    ["", "not-a-hash", "$2b$04$short", "$argon2id$v=19$broken"],
+)
+def test_malformed_hash_is_rejected_without_error(malformed_hash) -> None:
+    """Повреждённый хеш даёт False, а не исключение."""
+    assert verify_password("any-password", malformed_hash) is False
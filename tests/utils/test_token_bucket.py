@@ -0,0 +1,38 @@
+"""Тесты для локального режима TokenBucketLimiter (без Redis)."""
+
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils.cache import TokenBucketLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    state = {"now": 1000.0}
+    monkeypatch.setattr(cache_module.time, "time", lambda: state["now"])
+    monkeypatch.setattr(TokenBucketLimiter, "_local", {})
+    return state
+
+
+async def test_bucket_allows_burst_then_blocks(clock) -> None:
+    """После исчерпания ёмкости запросы отклоняются."""
+    results = [await TokenBucketLimiter.consume("login:1.2.3.4", 3, 60) for _ in range(4)]
+    assert results == [True, True, True, False]
+
+
+async def test_bucket_refills_over_time(clock) -> None:
+    """Токены восстанавливаются пропорционально прошедшему времени."""
+    for _ in range(3):
+        await TokenBucketLimiter.consume("login:1.2.3.4", 3, 60)
+    assert not await TokenBucketLimiter.consume("login:1.2.3.4", 3, 60)
+
+    clock["now"] += 20
+    assert await TokenBucketLimiter.consume("login:1.2.3.4", 3, 60)
+    assert not await TokenBucketLimiter.consume("login:1.2.3.4", 3, 60)
+
+
+async def test_buckets_are_independent_per_key(clock) -> None:
+    """Лимит одного клиента не влияет на другого."""
+    assert await TokenBucketLimiter.consume("forgot:a", 1, 60)
+    assert not await TokenBucketLimiter.consume("forgot:a", 1, 60)
+    assert await TokenBucketLimiter.consume("forgot:b", 1, 60)
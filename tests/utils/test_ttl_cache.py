@@ -0,0 +1,83 @@
+"""Тесты для in-process кеша app.utils.ttl_cache."""
+
+import pytest
+
+from app.utils import ttl_cache
+from app.utils.ttl_cache import TTLCache
+
+
+class _Clock:
+    """Управляемые часы для подмены time.monotonic."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", fake)
+    return fake
+
+
+def test_entry_expires_after_ttl(clock) -> None:
+    """Значение доступно до истечения TTL и пропадает после него."""
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("key", "value")
+
+    clock.now += 4.9
+    assert cache.get("key") == "value"
+
+    clock.now += 0.2
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_is_capped_by_default(clock) -> None:
+    """Индивидуальный TTL не может превышать TTL кеша."""
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=60)
+
+    clock.now += 2
+    assert "short" not in cache
+    assert cache.get("long") == 2
+
+    clock.now += 4
+    assert "long" not in cache
+
+
+def test_non_positive_ttl_is_not_stored(clock) -> None:
+    """Уже истёкшие записи в кеш не попадают."""
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("key", "value", ttl=0)
+    assert "key" not in cache
+
+
+def test_lru_eviction_keeps_recently_used(clock) -> None:
+    """При переполнении вытесняется наименее используемая запись."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_pop_and_clear(clock) -> None:
+    """pop и clear удаляют записи."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+
+    cache.clear()
+    assert len(cache) == 0